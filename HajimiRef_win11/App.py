@@ -5,11 +5,12 @@ Hajimi Ref (Windows) - Main Application Entry Point
 import sys
 import os
 from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QPalette, QColor, Qt, QIcon
+from PySide6.QtGui import QPalette, QColor, Qt, QIcon, QPixmapCache
 from PySide6.QtCore import QSize
 from Views.MainWindow import MainWindow
 from Config import Config
 from Models.ColorDepthManager import ColorDepthManager, ColorDepthMode
+from Models.ImageLoader import check_image_formats, pixmap_cache_limit
 
 if __name__ == "__main__":
     # 程序入口 / Program entry point
@@ -31,6 +32,15 @@ if __name__ == "__main__":
     # 将色深管理器挂载到 app 上，供全局访问 / Attach color depth manager to app for global access
     app.color_depth_manager = color_depth_mgr
     
+    # 已解码图片缓存上限（KB）：按解码上限容纳数张完整显示 pixmap 及其 mip 级别，
+    # 重复图片、离屏释放后的重新解码与缩小的 mip 级别直接命中
+    # Decoded image cache limit (KB): sized from the decode cap to hold several full display pixmaps
+    # and their mip levels, so duplicates, re-decodes after eviction and reduced mip levels hit it
+    QPixmapCache.setCacheLimit(pixmap_cache_limit())
+    
+    # 检查图片插件，便于发现缺少 libjpeg-turbo/libwebp 的构建 / Check the image plugins to spot builds missing libjpeg-turbo/libwebp
+    check_image_formats()
+    
     # Set App Icon    
     # Set App Icon - 为不同尺寸添加图标，确保任务栏显示正常
     icon_path = os.path.join(os.path.dirname(__file__), "assets", "icon.png")
@@ -53,23 +63,27 @@ if __name__ == "__main__":
     # 防止 palette 在未被 QSS 覆盖的边缘区域绘制不透明底色造成黑边
     # 非亚克力模式：使用不透明底色
     window_alpha = Config.bg_opacity if Config.acrylic_enabled else 255
-    palette.setColor(QPalette.Window, QColor(53, 53, 53, window_alpha))  # 窗口背景色 / Window background color
-    palette.setColor(QPalette.WindowText, Qt.white)            # 窗口前景色 (文字) / Window foreground color (text)
-    palette.setColor(QPalette.Base, QColor(25, 25, 25))         # 输入框等控件的背景色 (更深的灰色) / Background for input widgets (darker gray)
-    palette.setColor(QPalette.AlternateBase, QColor(53, 53, 53)) # 列表和表格的交替行颜色 / Alternate row color for lists/tables
-    palette.setColor(QPalette.ToolTipBase, Qt.white)           # 工具提示的背景色 / Tooltip background color
-    palette.setColor(QPalette.ToolTipText, Qt.white)           # 工具提示的文字颜色 / Tooltip text color
-    palette.setColor(QPalette.Text, Qt.white)                  # 输入框等控件的文字颜色 / Text color for input widgets
-    
-    # --- 按钮颜色 / Button Colors ---
-    palette.setColor(QPalette.Button, QColor(53, 53, 53))      # 按钮背景色 / Button background color
-    palette.setColor(QPalette.ButtonText, Qt.white)            # 按钮文字颜色 / Button text color
-    
-    # --- 高亮和链接颜色 / Highlight and Link Colors ---
-    palette.setColor(QPalette.BrightText, Qt.red)              # 用于需要特别突出的文本 (例如，验证失败时的警告) / Bright text for emphasis (e.g., validation errors)
-    palette.setColor(QPalette.Link, QColor(42, 130, 218))       # 超链接颜色 / Hyperlink color
-    palette.setColor(QPalette.Highlight, QColor(42, 130, 218))  # 选中项的背景色 (例如，列表中的选中项) / Highlight color for selected items
-    palette.setColor(QPalette.HighlightedText, Qt.black)       # 选中项的文字颜色 / Text color for selected items
+    palette_roles = (
+        (QPalette.Window, QColor(53, 53, 53, window_alpha)),   # 窗口背景色 / Window background color
+        (QPalette.WindowText, Qt.white),                       # 窗口前景色 (文字) / Window foreground color (text)
+        (QPalette.Base, QColor(25, 25, 25)),                   # 输入框等控件的背景色 (更深的灰色) / Background for input widgets (darker gray)
+        (QPalette.AlternateBase, QColor(53, 53, 53)),          # 列表和表格的交替行颜色 / Alternate row color for lists/tables
+        (QPalette.ToolTipBase, Qt.white),                      # 工具提示的背景色 / Tooltip background color
+        (QPalette.ToolTipText, Qt.white),                      # 工具提示的文字颜色 / Tooltip text color
+        (QPalette.Text, Qt.white),                             # 输入框等控件的文字颜色 / Text color for input widgets
+
+        # --- 按钮颜色 / Button Colors ---
+        (QPalette.Button, QColor(53, 53, 53)),                 # 按钮背景色 / Button background color
+        (QPalette.ButtonText, Qt.white),                       # 按钮文字颜色 / Button text color
+
+        # --- 高亮和链接颜色 / Highlight and Link Colors ---
+        (QPalette.BrightText, Qt.red),                         # 用于需要特别突出的文本 (例如，验证失败时的警告) / Bright text for emphasis (e.g., validation errors)
+        (QPalette.Link, QColor(42, 130, 218)),                 # 超链接颜色 / Hyperlink color
+        (QPalette.Highlight, QColor(42, 130, 218)),            # 选中项的背景色 (例如，列表中的选中项) / Highlight color for selected items
+        (QPalette.HighlightedText, Qt.black),                  # 选中项的文字颜色 / Text color for selected items
+    )
+    for role, color in palette_roles:
+        palette.setColor(role, color)
     
     # 应用调色板到整个应用程序 / Apply the customized palette to the entire application
     app.setPalette(palette)
@@ -17,6 +17,9 @@ class Config:
     inactive_bg_color = QColor(25, 25, 25)  # 非活动区域背景色（更深）
     grid_color = QColor(60, 60, 60)
     grid_size = 40
+    # grid_size 为 2 的幂时的位掩码（grid_size - 1），否则为 None；由 set_grid_size 维护
+    # Bit mask (grid_size - 1) when grid_size is a power of two, None otherwise; maintained by set_grid_size
+    _grid_mask = None
     grid_enabled = True
     dot_size = 2  # 点阵网格点大小（像素）/ Dot grid dot size (px)
     active_area_padding = 200  # 活动区域边距（像素）
@@ -50,6 +53,14 @@ class Config:
     acrylic_enabled = True  # 是否启用亚克力背景效果
     bg_opacity = 200  # 背景不透明度 0~255（越低越透明，控制背景色 alpha 通道）
 
+    @classmethod
+    def set_grid_size(cls, value):
+        """
+        设置网格大小并重新计算位掩码 / Set the grid size and recompute its bit mask
+        """
+        cls.grid_size = value
+        cls._grid_mask = value - 1 if value > 0 and (value & (value - 1)) == 0 else None
+
     @classmethod
     def reset_defaults(cls):
         """
@@ -59,7 +70,7 @@ class Config:
         cls.bg_color = QColor(40, 40, 40)
         cls.inactive_bg_color = QColor(25, 25, 25)
         cls.grid_color = QColor(60, 60, 60)
-        cls.grid_size = 40
+        cls.set_grid_size(40)
         cls.grid_enabled = True
         cls.active_area_padding = 200
         cls.initial_board_width = 2000
@@ -146,7 +157,7 @@ class Config:
             if "grid_color" in data:
                 cls.grid_color = QColor(data["grid_color"])
             if "grid_size" in data:
-                cls.grid_size = data["grid_size"]
+                cls.set_grid_size(int(data["grid_size"]))
             if "grid_enabled" in data:
                 cls.grid_enabled = data["grid_enabled"]
             if "dot_size" in data:
@@ -189,9 +200,30 @@ class Config:
         except (json.JSONDecodeError, IOError) as e:
             print(f"[Config] 加载配置失败，使用默认值: {e}")
 
+# 当前语言及其翻译表，语言切换后首次翻译时更新 / Current language and its table, refreshed on the first lookup after a switch
+_language_table = [None, None]
+
+def _current_table():
+    """
+    Return the translation table of the current language, cached until the language changes.
+    """
+    # 只比较语言名，避免每次调用都查找语言表与英文回退表 / Only the language name is compared, no table or English fallback lookup per call
+    language = Config.language
+    if _language_table[0] != language:
+        _language_table[:] = [language, LANGUAGES.get(language, LANGUAGES["en"])]
+    return _language_table[1]
+
 def tr(key):
     """
     Translate a key to the current language.
     """
     # 翻译函数 / Translation function
-    return LANGUAGES.get(Config.language, LANGUAGES["en"]).get(key, key)
+    return _current_table().get(key, key)
+
+def tr_batch(keys):
+    """
+    Translate several keys at once, resolving the language table a single time.
+    """
+    # 批量翻译：只查找一次当前语言表 / Batch translation: the current language table is looked up once
+    table = _current_table()
+    return {key: table.get(key, key) for key in keys}
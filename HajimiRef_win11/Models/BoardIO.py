@@ -0,0 +1,58 @@
+"""
+后台看板保存 / Background Board Saving
+在主线程快照看板数据后，由 QThreadPool 工作线程完成编码与写盘，再通过信号把结果交回主线程。
+The board is snapshotted on the main thread; a QThreadPool worker then encodes and writes it,
+and hands the result back to the main thread through a signal.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+from Models.ImageLoader import encode_image
+
+
+class BoardIOSignals(QObject):
+    """
+    看板读写任务的信号载体（QRunnable 不是 QObject，无法直接发射信号）
+    Signal carrier for board I/O tasks (QRunnable is not a QObject and cannot emit signals)
+    """
+    # (是否成功, 错误信息, 新编码的图片字节列表) / (success, error message, list of newly encoded image bytes)
+    saveFinished = Signal(bool, str, object)
+
+
+class BoardSaveTask(QRunnable):
+    """
+    在工作线程中写出看板文件的任务 / Task that writes a board file on a worker thread
+    items_data / groups_data 为主线程生成的快照（图片字节为隐式共享的 QByteArray，不会被界面修改）；
+    没有原始字节的图片（粘贴的图片）带有 "image"（QImage 快照），在此多线程无损编码后写入，
+    编码结果按出现顺序随 saveFinished 交回主线程
+    items_data / groups_data are main-thread snapshots (image bytes are implicitly shared QByteArrays
+    that the UI never mutates); images without original bytes (pastes) carry an "image" QImage snapshot
+    that is losslessly encoded here on several threads before writing, and the encoded bytes are handed
+    back in order with saveFinished
+    image_format: 新编码图片的格式，默认使用 lossless_format() / Format of newly encoded images, defaults to lossless_format()
+    """
+    def __init__(self, vm, path, items_data, groups_data, signals, image_format=None):
+        super().__init__()
+        self._vm = vm
+        self._path = path
+        self._items_data = items_data
+        self._groups_data = groups_data
+        self._signals = signals
+        self._image_format = image_format
+
+    def run(self):
+        """
+        工作线程入口 / Worker thread entry point
+        """
+        pending = [item for item in self._items_data if item.get("image") is not None]
+        encoded = []
+        if pending:
+            images = [item.pop("image") for item in pending]
+            with ThreadPoolExecutor(max_workers=max(1, os.cpu_count() or 1)) as executor:
+                encoded = list(executor.map(lambda image: encode_image(image, self._image_format), images))
+            for item, data in zip(pending, encoded):
+                item["data"] = data
+        success, error = self._vm.save_board_data(self._path, self._items_data, self._groups_data)
+        self._signals.saveFinished.emit(success, error or "", encoded)
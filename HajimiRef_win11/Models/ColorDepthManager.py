@@ -6,8 +6,8 @@ and OpenGL surface configuration.
 """
 
 from enum import Enum
-from PySide6.QtGui import QImage, QSurfaceFormat
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage, QImageReader, QSurfaceFormat
+from PySide6.QtCore import QObject, Signal, QBuffer, QByteArray, QIODevice
 
 
 class ColorDepthMode(Enum):
@@ -128,7 +128,20 @@ class ColorDepthManager(QObject):
         Returns:
             ImageColorDepthInfo 包含位深、alpha、原始格式信息
         """
-        fmt = image.format()
+        return cls.detect_format_depth(image.format())
+
+    @classmethod
+    def detect_format_depth(cls, fmt: QImage.Format) -> ImageColorDepthInfo:
+        """
+        按 QImage 格式查表得到色深信息。
+        Look up the color depth information of a QImage format.
+
+        Args:
+            fmt: QImage 格式
+
+        Returns:
+            ImageColorDepthInfo
+        """
         bits = cls._FORMAT_BIT_DEPTH.get(fmt, 8)
         has_alpha = cls._FORMAT_HAS_ALPHA.get(fmt, False)
         return ImageColorDepthInfo(
@@ -137,6 +150,22 @@ class ColorDepthManager(QObject):
             original_format=fmt
         )
 
+    @classmethod
+    def _detect_depth_from_reader(cls, reader: QImageReader) -> ImageColorDepthInfo:
+        """
+        由 QImageReader 检测色深：解码器能从文件头报告像素格式时（PNG/TIFF/JPEG 等）不解码像素，
+        否则才完整解码一次。
+        Detect color depth through a QImageReader: when the decoder reports the pixel format from
+        the header (PNG/TIFF/JPEG, ...) no pixels are decoded, otherwise the image is decoded once.
+        """
+        fmt = reader.imageFormat()
+        if fmt != QImage.Format.Format_Invalid:
+            return cls.detect_format_depth(fmt)
+        image = reader.read()
+        if not image.isNull():
+            return cls.detect_image_depth(image)
+        return ImageColorDepthInfo()  # 默认 8bit
+
     @classmethod
     def detect_depth_from_data(cls, data: bytes) -> ImageColorDepthInfo:
         """
@@ -144,15 +173,32 @@ class ColorDepthManager(QObject):
         Detect color depth from raw image data (header-only, minimal decoding).
 
         Args:
-            data: 图像的原始二进制数据
+            data: 图像的原始二进制数据（bytes 或 QByteArray）
 
         Returns:
             ImageColorDepthInfo
         """
-        image = QImage()
-        if image.loadFromData(data):
-            return cls.detect_image_depth(image)
-        return ImageColorDepthInfo()  # 默认 8bit
+        buffer = QBuffer()
+        buffer.setData(QByteArray(data))
+        if not buffer.open(QIODevice.ReadOnly):
+            return ImageColorDepthInfo()  # 默认 8bit
+        info = cls._detect_depth_from_reader(QImageReader(buffer))
+        buffer.close()
+        return info
+
+    @classmethod
+    def detect_depth_from_file(cls, path: str) -> ImageColorDepthInfo:
+        """
+        从图像文件检测色深（用于未在内存中保留原始字节的图片项；仅读取头部信息）。
+        Detect color depth from an image file (for items that keep no raw bytes in memory; header-only).
+
+        Args:
+            path: 图像文件路径
+
+        Returns:
+            ImageColorDepthInfo
+        """
+        return cls._detect_depth_from_reader(QImageReader(path))
 
     # ────────────────────────────────────────────
     # 2. 渲染格式选择 / Rendering format selection
@@ -0,0 +1,367 @@
+"""
+后台图片解码 / Background Image Decoding
+在 QThreadPool 工作线程中读取并解码图片文件，再通过信号把 QImage 交回主线程创建图形项。
+Reads and decodes image files on QThreadPool workers, then hands the QImage back to the
+main thread through a signal so the graphics item is created there.
+"""
+
+import os
+import hashlib
+
+from PySide6.QtCore import Qt, QObject, QRunnable, Signal, QByteArray, QBuffer, QFile, QIODevice, QSize
+from PySide6.QtGui import QImage, QImageReader, QImageWriter, QImageIOHandler
+from Models.ColorDepthManager import ColorDepthMode
+
+
+# 解码时的最长边上限：超过后按比例缩小解码（JPEG 可利用 DCT 缩放直接少解码像素），
+# 原始字节仍完整保留用于保存
+# Longest-side cap when decoding: larger images are decoded scaled down (JPEG can use DCT scaling
+# to skip pixels entirely); the original bytes are still kept intact for saving
+DECODE_MAX_SIDE = 4096
+# 按视口计算解码上限时的下限，防止窗口尚未显示（视口很小）时解码过小
+# Floor for viewport-based decode limits, so a not-yet-shown (tiny) viewport cannot shrink decodes too far
+DECODE_MIN_SIDE = 2048
+# 渐进显示时先行解码的预览最长边 / Longest side of the preview decoded first for progressive display
+PREVIEW_MAX_SIDE = 512
+# QPixmapCache 按解码上限可容纳的完整显示 pixmap 数（另加其 mip 级别）
+# Full display pixmaps at the decode cap that QPixmapCache holds (plus their mip levels)
+PIXMAP_CACHE_DECODES = 6
+
+
+def pixmap_cache_limit(max_side=DECODE_MAX_SIDE):
+    """
+    QPixmapCache 上限（KB）：PIXMAP_CACHE_DECODES 张按 max_side 解码的 32 位 pixmap，加上 mip 级别的 1/3；
+    重复图片、离屏释放后重新进入视野与显示缓存都依赖它命中
+    QPixmapCache limit (KB): PIXMAP_CACHE_DECODES 32-bit pixmaps decoded at max_side, plus a third
+    for their mip levels; duplicates, re-entry after eviction and the display cache all rely on hitting it
+    """
+    return PIXMAP_CACHE_DECODES * max_side * max_side * 4 * 4 // 3 // 1024
+
+
+def file_stamp(path):
+    """
+    文件的 (大小, 修改时间) 标记，用于判断源文件是否仍是导入时的内容；文件不可访问时返回 None
+    (size, mtime) stamp of a file, used to tell whether a source file still holds the imported
+    content; None if the file cannot be accessed
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def bytes_cache_key(data):
+    """
+    图片字节的缓存键：BLAKE2b-128 内容摘要（十六进制），直接读取 QByteArray 缓冲区；可在工作线程中调用
+    Cache key of image bytes: a BLAKE2b-128 content digest (hex) over the QByteArray buffer; callable on worker threads
+    """
+    try:
+        view = memoryview(data)
+    except TypeError:
+        view = data.data()
+    return hashlib.blake2b(view, digest_size=16).hexdigest()
+
+
+# 文件头 -> Qt 图片格式名（WebP 单独判断 RIFF....WEBP）/ Header -> Qt image format name (WebP is checked separately as RIFF....WEBP)
+FORMAT_MAGICS = (
+    (b"\x89PNG", b"png"),
+    (b"\xff\xd8\xff", b"jpeg"),
+    (b"GIF8", b"gif"),
+    (b"BM", b"bmp"),
+    (b"II*\x00", b"tiff"),
+    (b"MM\x00*", b"tiff"),
+)
+
+
+def sniff_format(header):
+    """
+    按文件头识别 Qt 图片格式名，未知时返回 b"" / Detect the Qt image format name from a header, b"" if unknown
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return b"webp"
+    for magic, fmt in FORMAT_MAGICS:
+        if header.startswith(magic):
+            return fmt
+    return b""
+
+
+def check_image_formats():
+    """
+    启动时检查一次图片插件，缺少 JPEG/PNG/WebP 时给出提示（插件齐全时不输出）
+    Check the image plugins once at startup, warning when JPEG/PNG/WebP are missing (silent when all are present)
+    """
+    formats = [bytes(fmt.data()).decode("ascii", "replace") for fmt in QImageReader.supportedImageFormats()]
+    missing = [fmt for fmt in ("jpeg", "png", "webp") if fmt not in formats]
+    if missing:
+        print(f"Warning: missing image plugins: {', '.join(missing)}")
+
+
+def _open_reader(source):
+    """
+    为 QByteArray 或文件路径创建 QImageReader / Create a QImageReader for a QByteArray or a file path
+    先按文件头识别格式并直接指定对应插件，跳过逐个插件探测；无法识别时才让 Qt 按内容探测
+    The format is sniffed from the header and its plugin named directly, skipping the plugin-by-plugin
+    probe; Qt only probes the content itself when the header is not recognised
+    返回 / Returns: (reader, device)，调用方读取完毕后关闭 device / the caller closes device once done reading
+    """
+    if isinstance(source, str):
+        device = QFile(source)
+    else:
+        device = QBuffer()
+        device.setData(source)
+    if not device.open(QIODevice.ReadOnly):
+        # 交给 QImageReader 报告错误 / Let QImageReader report the error
+        reader = QImageReader(source)
+        return reader, None
+    fmt = sniff_format(device.peek(16).data())
+    reader = QImageReader(device, QByteArray(fmt))
+    # 无法识别时按内容识别格式（扩展名可能与实际格式不符）/ Unrecognised: detect the format from content (extensions may lie)
+    reader.setDecideFormatFromContent(not fmt)
+    return reader, device
+
+
+def read_image_size(source):
+    """
+    只读取文件头中的图片尺寸，不解码像素；无法识别时返回无效 QSize
+    Read the image size from the header only, without decoding pixels; an invalid QSize if unrecognised
+    """
+    reader, device = _open_reader(source)
+    size = reader.size()
+    if device is not None:
+        device.close()
+    return size
+
+
+def wants_preview(source, max_side=DECODE_MAX_SIDE):
+    """
+    是否值得先显示低分辨率预览：只读取文件头，图片远大于预览尺寸且解码器原生支持缩小解码（JPEG 的 DCT 缩放、
+    libwebp 的缩放输出）时才成立；PNG 等格式缩小解码仍需完整解码，预览反而多一次开销
+    Whether a low-resolution preview is worth showing first: only the header is read, and it holds when the
+    image is far larger than the preview and the decoder scales natively (JPEG DCT scaling, libwebp scaled
+    output); formats like PNG still decode fully when scaled, so a preview would only add a pass
+    """
+    reader, device = _open_reader(source)
+    size = reader.size()
+    result = (size.isValid() and min(max(size.width(), size.height()), max_side) > PREVIEW_MAX_SIDE * 2
+              and reader.supportsOption(QImageIOHandler.ScaledSize))
+    if device is not None:
+        device.close()
+    return result
+
+
+def decode_image(source, max_side=DECODE_MAX_SIDE):
+    """
+    解码图片，超过 max_side 的大图缩小解码
+    Decode an image, shrinking images larger than max_side on load
+    source: 内存中的 QByteArray，或文件路径（由 QImageReader 直接从文件解码，不经过内存副本）
+            An in-memory QByteArray, or a file path (QImageReader decodes straight from the file,
+            without an in-memory copy)
+    返回 / Returns: (QImage, 原图尺寸 QSize / original QSize)，失败时 QImage 为空 / null QImage on failure
+    """
+    reader, device = _open_reader(source)
+
+    # 先读取文件头中的尺寸，无需解码像素 / Read the size from the header without decoding pixels
+    source_size = reader.size()
+    if source_size.isValid() and max(source_size.width(), source_size.height()) > max_side:
+        reader.setScaledSize(source_size.scaled(max_side, max_side, Qt.KeepAspectRatio))
+
+    image = reader.read()
+    if image.isNull():
+        print(f"Failed to decode image data: {reader.errorString()}")
+    if device is not None:
+        device.close()
+
+    if not source_size.isValid():
+        source_size = image.size()
+    return image, source_size
+
+
+# 无原始字节的图片（粘贴）使用的无损编码格式，首次编码时探测 / Lossless format for images without original bytes (pastes), probed on first encode
+_lossless_format = None
+# PNG 回退编码的 quality：Qt 把 quality 映射为 zlib 级别 (100 - q) * 9 / 91，80 对应级别 1（最快的压缩）
+# quality for the PNG fallback: Qt maps quality to zlib level (100 - q) * 9 / 91, so 80 gives level 1 (fastest compression)
+PNG_FAST_QUALITY = 80
+
+
+def lossless_format():
+    """
+    优先 WebP 无损（比 PNG 更小、编码更快），缺少 WebP 插件时回退到 PNG
+    Prefer lossless WebP (smaller and faster to encode than PNG), fall back to PNG without the WebP plugin
+    """
+    global _lossless_format
+    if _lossless_format is None:
+        _lossless_format = "WEBP" if b"webp" in QImageWriter.supportedImageFormats() else "PNG"
+    return _lossless_format
+
+
+def encode_image(image, fmt=None):
+    """
+    将 QImage 无损编码为 QByteArray（QImage 可在工作线程中编码）
+    Losslessly encode a QImage into a QByteArray (QImage may be encoded on a worker thread)
+    fmt: 编码格式，默认使用 lossless_format() / Encoding format, defaults to lossless_format()
+    """
+    fmt = fmt or lossless_format()
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    # Qt 的 WebP 写入器在 quality=100 时使用无损模式；PNG 始终无损，只选用最快的压缩级别
+    # Qt's WebP writer switches to lossless at quality=100; PNG is always lossless and just uses the fastest level
+    image.save(buffer, fmt, 100 if fmt == "WEBP" else PNG_FAST_QUALITY if fmt == "PNG" else -1)
+    buffer.close()
+    return data
+
+
+# QPixmap.fromImage 会在主线程预乘的格式 -> 预乘后的格式；提前在工作线程转换，主线程只需包装
+# Formats QPixmap.fromImage would premultiply on the main thread -> premultiplied format; converting them on
+# the worker leaves the main thread a plain wrap
+_PIXMAP_FORMATS = {
+    QImage.Format_ARGB32: QImage.Format_ARGB32_Premultiplied,
+    QImage.Format_RGBA8888: QImage.Format_ARGB32_Premultiplied,
+    QImage.Format_RGBA64: QImage.Format_RGBA64_Premultiplied,
+}
+
+
+def to_pixmap_format(image):
+    """
+    转换为光栅 QPixmap 原生保存的格式（带 alpha 的图像预乘，调色板图像展开为 32 位），
+    使 QPixmap.fromImage 不再逐像素转换；适合在工作线程调用
+    Convert to a format a raster QPixmap stores as-is (alpha images premultiplied, palette images expanded
+    to 32 bits), so QPixmap.fromImage needs no per-pixel pass; meant to be called on a worker thread
+    """
+    fmt = image.format()
+    target = _PIXMAP_FORMATS.get(fmt)
+    if target is None and fmt == QImage.Format_Indexed8:
+        target = QImage.Format_ARGB32_Premultiplied if image.hasAlphaChannel() else QImage.Format_RGB32
+    if target is None:
+        return image
+    return image.convertToFormat(target)
+
+
+def to_display_image(image, color_depth_manager):
+    """
+    为显示准备解码结果：高位深图像（非强制8bit模式）转换为高精度格式，其余保持原位深；
+    最后转换为 QPixmap 原生格式
+    Prepare a decoded image for display: high bit-depth images (unless forced 8bit) are converted
+    to a high-precision format, everything else keeps its depth; the result ends in QPixmap's native format
+    """
+    if image.isNull():
+        return image
+    if color_depth_manager is not None:
+        depth_info = color_depth_manager.detect_image_depth(image)
+        if depth_info.is_high_bit_depth and color_depth_manager.mode != ColorDepthMode.FORCE_8BIT:
+            image = color_depth_manager.convert_image(image)
+    return to_pixmap_format(image)
+
+
+class ImageLoadSignals(QObject):
+    """
+    解码任务的信号载体（QRunnable 不是 QObject，无法直接发射信号）
+    Signal carrier for decode tasks (QRunnable is not a QObject and cannot emit signals)
+    """
+    # (解码后的图像, x, y, 源文件路径, 原图尺寸, 解码上限) / (decoded image, x, y, source file path, original size, decode cap)
+    imageLoaded = Signal(QImage, float, float, str, QSize, int)
+
+
+class ImageLoadTask(QRunnable):
+    """
+    直接从文件解码单个图片的后台任务 / Background task that decodes one image straight from its file
+    QImage 可以在非 GUI 线程安全使用；QPixmap 只能在主线程创建，因此这里只产出 QImage。
+    QImage is safe to use off the GUI thread; QPixmap must be created on the main thread,
+    so this task only produces a QImage.
+    """
+    def __init__(self, path, x, y, signals, color_depth_manager=None, max_side=DECODE_MAX_SIDE):
+        super().__init__()
+        self._path = path
+        self._x = x
+        self._y = y
+        self._signals = signals
+        self._cdm = color_depth_manager
+        self._max_side = max_side
+
+    def run(self):
+        """
+        工作线程入口 / Worker thread entry point
+        """
+        # 直接从文件解码（大图缩小解码），不把整个文件读入内存；原始字节在保存时才从源文件读取
+        # Decode straight from the file (large images shrink on load) without reading it into memory;
+        # the original bytes are only read from the source file when the board is saved
+        image, source_size = decode_image(self._path, self._max_side)
+        if image.isNull():
+            print(f"Failed to decode image {self._path}")
+            return
+
+        # 色深格式转换同样属于 CPU 密集型工作，放在工作线程完成
+        # Color depth conversion is CPU-bound as well, so do it on the worker
+        if self._cdm is not None:
+            image = self._cdm.convert_image(image)
+        image = to_pixmap_format(image)
+
+        self._signals.imageLoaded.emit(image, self._x, self._y, self._path, source_size, self._max_side)
+
+
+class ImageDecodeSignals(QObject):
+    """
+    重新解码任务的信号载体 / Signal carrier for re-decode tasks
+    """
+    # (显示缓存键, 解码后的图像, 原图尺寸) / (display cache key, decoded image, original size)
+    imageDecoded = Signal(str, QImage, QSize)
+    # (显示缓存键, 低分辨率预览) / (display cache key, low-resolution preview)
+    imagePreviewed = Signal(str, QImage)
+    # (缩小版本的缓存键, 缩小后的图像) / (cache key of the reduced version, reduced image)
+    imageScaled = Signal(str, QImage)
+
+
+class ImageDecodeTask(QRunnable):
+    """
+    在后台解码已在画布上的图片的完整显示版本（渐进显示：预览先行，完整图随后替换）
+    Background decode of the full display image of an item already on the canvas
+    (progressive display: the preview shows first, the full image replaces it afterwards)
+    """
+    def __init__(self, source, cache_key, signals, color_depth_manager=None, max_side=DECODE_MAX_SIDE, preview=False):
+        """
+        preview: 图片项尚无可显示内容：可快速缩小解码的大图先发出预览（文件头检测也在工作线程中完成）
+                 The item has nothing to show yet: large images that scale cheaply emit a preview first
+                 (the header probe also happens on the worker)
+        """
+        super().__init__()
+        self._source = source
+        self._cache_key = cache_key
+        self._signals = signals
+        self._cdm = color_depth_manager
+        self._max_side = max_side
+        self._preview = preview
+
+    def run(self):
+        """
+        工作线程入口 / Worker thread entry point
+        """
+        if self._preview and wants_preview(self._source, self._max_side):
+            preview, _ = decode_image(self._source, PREVIEW_MAX_SIDE)
+            if not preview.isNull():
+                self._signals.imagePreviewed.emit(self._cache_key, to_display_image(preview, self._cdm))
+        image, source_size = decode_image(self._source, self._max_side)
+        # 失败时同样发射（空图像），以便主线程清理等待队列 / Emitted on failure too (null image) so the main thread clears its waiters
+        self._signals.imageDecoded.emit(self._cache_key, to_display_image(image, self._cdm), source_size)
+
+
+class ImageScaleTask(QRunnable):
+    """
+    在后台把显示图像缩小为指定的 mip 级别（每级边长减半），缩小时平滑采样
+    Background reduction of a display image to a mip level (each level halves the sides), smoothly sampled
+    """
+    def __init__(self, image, cache_key, level, signals):
+        super().__init__()
+        self._image = image
+        self._cache_key = cache_key
+        self._level = level
+        self._signals = signals
+
+    def run(self):
+        """
+        工作线程入口 / Worker thread entry point
+        """
+        width = max(1, self._image.width() >> self._level)
+        height = max(1, self._image.height() >> self._level)
+        image = self._image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self._signals.imageScaled.emit(self._cache_key, image)
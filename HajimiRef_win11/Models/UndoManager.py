@@ -170,8 +170,8 @@ class ClearBoardCommand(Command):
                 item.setRotation(data['rotation'])
     
     def redo(self):
-        # 重新清空
-        for data in self._items_data:
+        # 重新清空（倒序移除，Qt 每次从顶层列表末尾删除）
+        for data in reversed(self._items_data):
             item = data['item']
             if item.scene():
                 self._scene.removeItem(item)
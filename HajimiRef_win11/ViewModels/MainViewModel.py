@@ -1,61 +1,539 @@
+import os
 import json
-import base64
+import mmap
+import binascii
+import hashlib
+import functools
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QByteArray, QFile, QIODevice
+from Models.ImageLoader import bytes_cache_key
+
+# orjson 为可选依赖：直接输出/解析 UTF-8 bytes，比标准库 json 快数倍；缺失时回退到 json
+# orjson is optional: it emits/parses UTF-8 bytes directly and is several times faster than json; fall back if missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 以下可选依赖只在保存/读取看板时用到，首次使用时才在函数内导入，不拖慢启动
+# （导入语句保持字面形式，PyInstaller 仍能找到并打包它们）
+# The optional dependencies below are only used to save/load boards and are imported inside functions on
+# first use so they do not slow down startup (the import statements stay literal, so PyInstaller still
+# finds and bundles them)
+
+
+@functools.lru_cache(maxsize=None)
+def _ijson():
+    """
+    ijson：流式解析旧版 JSON 看板，避免整体载入；未安装时返回 None
+    ijson: streams legacy JSON boards instead of loading them whole; None if not installed
+    """
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
+
+
+@functools.lru_cache(maxsize=None)
+def _zstandard():
+    """
+    zstandard：压缩清单与未压缩的图片条目，缺失时按原样存储；未安装时返回 None
+    zstandard: compresses the manifest and uncompressed image entries, stored as-is if missing; None if not installed
+    """
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+# 看板容器格式常量 / Board container format constants
+ZIP_MAGIC = b"PK\x03\x04"          # ZIP 文件头 / ZIP local file header signature
+MANIFEST_NAME = "manifest.json"    # 容器内的清单文件 / Manifest entry inside the container
+# ZIP 容器使用单独的扩展名；.sref 仍为旧版 JSON，与 macOS 版本互通
+# The ZIP container has its own extension; .sref stays legacy JSON, shared with the macOS app
+BOARD_ARCHIVE_EXT = ".srefz"
+BOARD_VERSION = 5                  # 版本5改为 ZIP 容器 + 原始图片条目 / Version 5 switches to ZIP container + raw image entries
+LEGACY_JSON_VERSION = 4            # 旧版 JSON（Base64）格式版本 / Legacy JSON (Base64) format version
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"    # zstd 帧头 / zstd frame magic
+ZSTD_SUFFIX = ".zst"               # zstd 压缩条目的文件名后缀 / Name suffix of zstd-compressed entries
+ZSTD_LEVEL = 3                     # 压缩级别（速度优先）/ Compression level (speed first)
+
+IMAGE_DIR = "images/"              # 容器内图片条目所在目录 / Folder of image entries inside the container
+
+# 图片文件头 -> 扩展名，用于给容器条目命名 / Image file header -> extension, used to name container entries
+IMAGE_MAGICS = (
+    (b"\x89PNG", "png"),
+    (b"\xff\xd8\xff", "jpg"),
+    (b"GIF8", "gif"),
+    (b"RIFF", "webp"),       # RIFF....WEBP
+    (b"BM", "bmp"),
+    (b"II*\x00", "tif"),
+    (b"MM\x00*", "tif"),
+)
+# 已是压缩格式的扩展名，这些条目不再二次压缩 / Already-compressed formats, never recompressed
+PRECOMPRESSED_EXTS = frozenset(("png", "jpg", "gif", "webp"))
+
+# Base64 编解码线程数（QByteArray 的 C++ 调用期间释放 GIL，可多核并行）
+# Base64 codec worker count (QByteArray's C++ calls release the GIL, so they run in parallel)
+BASE64_WORKERS = max(1, os.cpu_count() or 1)
+# 读取时最多提前解码的图片数，保持流式读取的内存上限 / Images decoded ahead while loading, keeps streaming memory bounded
+BASE64_PREFETCH = BASE64_WORKERS * 2
+# 读取 ZIP 看板时提前读取/解压图片条目的工作线程数与最多提前的条目数（读取与 zstd 解压期间释放 GIL）
+# Workers that read/decompress image entries ahead while loading a ZIP board, and how many entries they may
+# run ahead (file reads and zstd decompression release the GIL)
+ZIP_READ_WORKERS = 4
+ZIP_PREFETCH = ZIP_READ_WORKERS * 2
+# 达到此大小的图片在写出时分块编码 Base64，不在内存中生成整张图片的编码
+# Images of at least this size are Base64-encoded in chunks while writing, never encoded whole in memory
+BASE64_STREAM_MIN = 16 << 20
+# 分块编码的块大小（3 的倍数，块之间不产生填充）/ Chunk size for chunked encoding (a multiple of 3, so no padding between chunks)
+BASE64_CHUNK = 3 << 16
+
+
+def _json_loads(buf):
+    """
+    解析 JSON（接受 bytes / memoryview）/ Parse JSON (accepts bytes / memoryview)
+    """
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(bytes(buf))
+
+
+def _json_dumps(obj):
+    """
+    序列化为紧凑的 UTF-8 bytes / Serialize to compact UTF-8 bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    # 看板数据是纯树结构，关闭循环引用检查可省去每个容器的 id 登记
+    # Board data is a plain tree, so skipping the circular-reference check saves an id bookkeeping per container
+    return json.dumps(obj, ensure_ascii=False, check_circular=False, separators=(",", ":")).encode("utf-8")
+
+
+def _sniff_image_ext(data):
+    """
+    按文件头识别图片格式的扩展名，未知格式返回 "bin" / Detect the image extension from its header, "bin" if unknown
+    """
+    for magic, ext in IMAGE_MAGICS:
+        if data.startswith(magic):
+            return ext
+    return "bin"
+
+
+def _byte_view(data):
+    """
+    QByteArray -> 只读 memoryview（直接引用其缓冲区，不复制）；不支持缓冲区协议的绑定版本回退为 bytes 副本
+    QByteArray -> read-only memoryview over its buffer (no copy); bindings without buffer protocol
+    support fall back to a bytes copy
+    """
+    try:
+        return memoryview(data)
+    except TypeError:
+        return data.data()
+
+
+def _zstd_decompress(data):
+    """
+    解压 zstd 帧；未安装 zstandard 时报错 / Decompress a zstd frame; raises if zstandard is not installed
+    """
+    zstandard = _zstandard()
+    if zstandard is None:
+        raise RuntimeError("This board is zstd-compressed, please install the 'zstandard' package")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def _b64_encode(data):
+    """
+    QByteArray -> Base64 ASCII 字节串 / QByteArray -> Base64 ASCII bytes
+    """
+    return data.toBase64().data()
+
+
+def _b64_decode(b64_data):
+    """
+    Base64 字符串 -> QByteArray / Base64 string -> QByteArray
+    """
+    return QByteArray.fromBase64(b64_data.encode("ascii"))
+
+
+def _keyed(img_bytes):
+    """
+    图片字节 -> (字节, 缓存键)：在读取图片的工作线程中求摘要，画布首次绘制时无需再在主线程计算
+    Image bytes -> (bytes, cache key): digested on the worker that read the image, so the canvas need not
+    compute it on the GUI thread at first paint
+    """
+    return img_bytes, bytes_cache_key(img_bytes)
+
+
+def _map_ordered(executor, fn, iterable, prefetch):
+    """
+    按输入顺序产出 executor 的结果，最多同时提交 prefetch 个任务（Executor.map 会一次性提交全部）
+    Yield executor results in input order with at most prefetch tasks in flight
+    (Executor.map would submit everything up front)
+    每项产出 (输入, future) / Yields (input, future) pairs
+    """
+    pending = deque()
+    for value in iterable:
+        pending.append((value, executor.submit(fn, value)))
+        if len(pending) >= prefetch:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
 
 class MainViewModel:
     def read_image_file(self, path):
         """
-        读取图片文件并返回二进制数据
-        Reads an image file and returns binary data
+        读取图片文件并返回 QByteArray（直接由 QFile 读取，不经过 Python bytes）
+        Reads an image file and returns a QByteArray (read by QFile directly, no Python bytes in between)
         """
-        try:
-            with open(path, "rb") as f:
-                return f.read()
-        except Exception as e:
-            print(f"Error reading file {path}: {e}")
+        f = QFile(path)
+        if not f.open(QIODevice.ReadOnly):
+            print(f"Error reading file {path}: {f.errorString()}")
             return None
+        data = f.readAll()
+        f.close()
+        return data
 
-    def save_board_data(self, path, items_data):
+    def _item_payload(self, item):
         """
-        保存看板数据到 JSON 文件
-        Saves the board data to a JSON file
+        取得图片项的原始字节：从文件导入的图片不在内存中保留字节，此时读取其源文件
+        Get an item's raw image bytes: images imported from files keep no bytes in memory,
+        so their source file is read instead
         """
-        data = {
-            "version": 3,  # 版本3添加了zIndex字段支持图层顺序
-            "images": items_data
-        }
+        data = item.get("data")
+        if data is None:
+            data = self.read_image_file(item["path"])
+            if data is None:
+                raise OSError(f"Cannot read image file {item['path']}")
+        return data
+
+    def _item_payload_size(self, item):
+        """
+        图片原始字节的大小（不读取内容）/ Size of an item's raw image bytes (without reading them)
+        """
+        data = item.get("data")
+        if data is None:
+            return os.path.getsize(item["path"])
+        return data.size()
+
+    def _encode_item_b64(self, item):
+        """
+        在工作线程中整体编码一张图片的 Base64；大图返回 None，留给写出时分块编码
+        Base64-encode one image whole on a worker; large images return None and are encoded in chunks while writing
+        """
+        if self._item_payload_size(item) >= BASE64_STREAM_MIN:
+            return None
+        return _b64_encode(self._item_payload(item))
+
+    def _write_b64_chunks(self, f, item):
+        """
+        分块读取图片字节并逐块写出 Base64，内存中只持有一块 / Read an image in chunks and write its Base64 chunk by chunk, holding one chunk at a time
+        """
+        data = item.get("data")
+        if data is None:
+            with open(item["path"], "rb") as src:
+                for chunk in iter(lambda: src.read(BASE64_CHUNK), b""):
+                    f.write(binascii.b2a_base64(chunk, newline=False))
+            return
+        view = _byte_view(data)
+        for offset in range(0, len(view), BASE64_CHUNK):
+            f.write(binascii.b2a_base64(view[offset:offset + BASE64_CHUNK], newline=False))
+
+    def save_board_data(self, path, items_data, groups_data=None):
+        """
+        保存看板数据到 ZIP 容器（.srefz）：manifest.json 记录位置/缩放等元数据，每张图片以原始字节存为 images/ 下的单独条目（无 Base64）。
+        其余路径（.sref / .json）写出旧版 JSON 格式，macOS 版本只能读取这种格式。
+        Saves the board data to a ZIP container (.srefz): manifest.json holds positions/scales,
+        each image is stored as a raw entry under images/ (no Base64), named by its sniffed format.
+        Any other path (.sref / .json) gets the legacy JSON layout, the only one the macOS app reads.
+        安装了 zstandard 时，清单与非压缩格式的图片（BMP/TIFF 等）以 zstd 压缩并加 .zst 后缀。
+        With zstandard installed, the manifest and images in uncompressed formats (BMP/TIFF, ...)
+        are zstd-compressed and get a .zst suffix.
+        """
+        groups_data = groups_data or []
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f)
+            if not path.lower().endswith(BOARD_ARCHIVE_EXT):
+                self._save_legacy_json(path, items_data, groups_data)
+                return True, None
+
+            # 先写入临时文件，完整写出后再替换，读取源图片或写出中途失败时不会截断原有看板
+            # Write a temporary file and swap it in once complete, so a failed source read or write never truncates the existing board
+            tmp_path = path + ".tmp"
+            try:
+                self._write_zip_board(tmp_path, items_data, groups_data)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
             return True, None
         except Exception as e:
             return False, str(e)
 
-    def load_board_data(self, path):
+    def _write_zip_board(self, path, items_data, groups_data):
+        """
+        写出 ZIP 容器内容 / Write the ZIP container content
+        """
+        manifest_images = []
+        # 已写出的图片：内容摘要 -> 条目名，重复的图片只存一份 / Images written so far: content digest -> entry name, duplicates are stored once
+        written = {}
+        # 多线程 zstd 压缩器（threads=-1 使用全部核心）/ Multi-threaded zstd compressor (threads=-1 uses all cores)
+        zstandard = _zstandard()
+        cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1) if zstandard is not None else None
+        # 图片本身已是压缩格式（PNG/JPEG），使用 ZIP_STORED 避免无意义的二次压缩
+        # Images are already compressed (PNG/JPEG), ZIP_STORED avoids pointless recompression
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+            for index, item in enumerate(items_data):
+                entry = {key: value for key, value in item.items() if key not in ("data", "path")}
+                if item.get("data") is None:
+                    # 从文件导入的图片：mmap 源文件直接写入条目，字节留在系统页缓存中，不复制进进程内存
+                    # Images imported from files: the mmapped source file is written straight into the entry,
+                    # so the bytes stay in the OS page cache instead of being copied into process memory
+                    with open(item["path"], "rb") as f, \
+                            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        entry["file"] = self._write_image_entry(zf, index, mm, cctx, written)
+                else:
+                    # 字节经 memoryview 直接写入，不先复制为 Python bytes / Bytes go in through a memoryview, never copied into Python bytes first
+                    entry["file"] = self._write_image_entry(zf, index, _byte_view(item["data"]), cctx, written)
+                manifest_images.append(entry)
+
+            manifest = {
+                "version": BOARD_VERSION,
+                "images": manifest_images,
+                "groups": groups_data
+            }
+            manifest_bytes = _json_dumps(manifest)
+            if cctx is not None:
+                zf.writestr(MANIFEST_NAME + ZSTD_SUFFIX, cctx.compress(manifest_bytes))
+            else:
+                zf.writestr(MANIFEST_NAME, manifest_bytes)
+
+    def _write_image_entry(self, zf, index, img_bytes, cctx, written):
         """
-        从 JSON 文件加载看板数据，并解码 Base64 图片数据
-        Loads board data from a JSON file and decodes Base64 image data
+        把一张图片写为 images/ 下的条目并返回条目名（img_bytes 可为 bytes、memoryview 或 mmap）
+        Write one image as an entry under images/ and return the entry name (img_bytes may be bytes, a memoryview or an mmap)
+        written: 内容摘要 -> 已写出的条目名；内容相同的图片直接引用已有条目
+                 Content digest -> entry name already written; identical images reference the existing entry
         """
+        digest = hashlib.blake2b(img_bytes, digest_size=16).digest()
+        file_name = written.get(digest)
+        if file_name is not None:
+            return file_name
+        # 扩展名按实际内容识别（粘贴的图片为 PNG，拖入的文件保持原格式）
+        # The extension follows the actual content (pasted images are PNG, dropped files keep their format)
+        ext = _sniff_image_ext(bytes(img_bytes[:16]))
+        file_name = "%s%d.%s" % (IMAGE_DIR, index, ext)
+        if cctx is not None and ext not in PRECOMPRESSED_EXTS:
+            img_bytes = cctx.compress(img_bytes)
+            file_name += ZSTD_SUFFIX
+        zf.writestr(file_name, img_bytes)
+        written[digest] = file_name
+        return file_name
+
+    def _save_legacy_json(self, path, items_data, groups_data):
+        """
+        写出旧版 JSON 格式（图片为 Base64 字符串）/ Write the legacy JSON layout (images as Base64 strings)
+        Base64 编码由 QByteArray.toBase64() 在 C++ 中完成，并分发到多个工作线程；
+        逐张图片流式写入文件，内存中最多同时持有 BASE64_PREFETCH 张图片的 Base64；
+        超过 BASE64_STREAM_MIN 的大图在写出时分块编码
+        Base64 encoding is done in C++ by QByteArray.toBase64(), spread across worker threads;
+        images are streamed into the file one by one, with at most BASE64_PREFETCH encodings held in memory;
+        images above BASE64_STREAM_MIN are encoded in chunks as they are written
+        """
+        # 先写入临时文件，完整写出后再替换，读取源图片失败时不会截断原有看板
+        # Write a temporary file and swap it in once complete, so a failed source read never truncates the existing board
+        tmp_path = path + ".tmp"
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            images = []
-            for img_data in data.get("images", []):
-                b64_data = img_data.get("data")
-                if b64_data:
-                    try:
-                        img_bytes = base64.b64decode(b64_data)
-                        images.append({
-                            "x": img_data.get("x", 0),
-                            "y": img_data.get("y", 0),
-                            "scale": img_data.get("scale", 1.0),
-                            "rotation": img_data.get("rotation", 0),
-                            "zIndex": img_data.get("zIndex", 0),  # 读取图层顺序 / Load layer order
-                            "data": img_bytes
-                        })
-                    except Exception as decode_err:
-                        print(f"Error decoding image data: {decode_err}")
+            self._write_legacy_json(tmp_path, items_data, groups_data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _write_legacy_json(self, path, items_data, groups_data):
+        """
+        流式写出旧版 JSON 内容 / Stream the legacy JSON content out
+        """
+        with ThreadPoolExecutor(max_workers=BASE64_WORKERS) as executor, \
+                open(path, "wb", buffering=1 << 20) as f:
+            f.write(b'{"version":%d,"images":[' % LEGACY_JSON_VERSION)
+            encoded = _map_ordered(executor, self._encode_item_b64, items_data, BASE64_PREFETCH)
+            for index, (item, future) in enumerate(encoded):
+                entry = {key: value for key, value in item.items() if key not in ("data", "path")}
+                # 元数据经 JSON 序列化，Base64 字节直接拼接到对象末尾，不经过 Python str
+                # Metadata goes through JSON; the Base64 bytes are spliced onto the end of the object, never a Python str
+                if index:
+                    f.write(b",")
+                f.write(_json_dumps(entry)[:-1])
+                f.write(b',"data":"')
+                b64 = future.result()
+                if b64 is None:
+                    self._write_b64_chunks(f, item)
+                else:
+                    f.write(b64)
+                f.write(b'"}')
+            f.write(b'],"groups":')
+            f.write(_json_dumps(groups_data))
+            f.write(b"}")
+
+    def iter_board_data(self, path):
+        """
+        流式读取看板：根据文件头自动识别 ZIP 容器或旧版 JSON（Base64）格式，
+        逐条产出 ("image", 记录) / ("group", 组数据)，内存中同一时刻只持有一张图片的字节。
+        Streams a board: detects ZIP container or legacy JSON (Base64) by file magic and
+        yields ("image", record) / ("group", group_data) one at a time, so only one image's
+        bytes are held in memory at once.
+        读取失败时直接抛出异常，由调用方处理 / Raises on failure, the caller handles errors
+        """
+        with open(path, "rb") as f:
+            magic = f.read(len(ZIP_MAGIC))
+
+        if magic == ZIP_MAGIC:
+            yield from self._iter_zip_board(path)
+        else:
+            yield from self._iter_legacy_json(path)
+
+    def _iter_zip_board(self, path):
+        """
+        读取 ZIP 容器：先解析清单，再按条目惰性读取原始图片字节（zstd 条目按帧头识别并解压）
+        Read the ZIP container: parse the manifest, then lazily read raw image bytes per entry
+        (zstd entries are detected by their frame magic and decompressed)
+        """
+        with zipfile.ZipFile(path, "r") as zf:
+            try:
+                manifest_bytes = self._read_zip_entry(zf, MANIFEST_NAME + ZSTD_SUFFIX)
+            except KeyError:
+                manifest_bytes = self._read_zip_entry(zf, MANIFEST_NAME)
+            manifest = _json_loads(manifest_bytes)
+            images = [entry for entry in manifest.get("images", []) if entry.get("file")]
+            # 被多张图片引用的条目只读取一次，各图片共享同一 QByteArray（隐式共享），最后一次引用后释放
+            # Entries referenced by several images are read once and share one QByteArray (implicitly shared),
+            # released after their last reference
+            remaining = Counter(entry["file"] for entry in images)
+            # 按首次引用顺序在工作线程中提前读取各条目，主线程按清单顺序取用
+            # Entries are read ahead on worker threads in first-reference order; the main thread consumes them in manifest order
+            unique_names = list(dict.fromkeys(entry["file"] for entry in images))
+            shared = {}
+            with ThreadPoolExecutor(max_workers=ZIP_READ_WORKERS) as executor:
+                reads = _map_ordered(executor, lambda name: self._read_image_entry(zf, name),
+                                     unique_names, ZIP_PREFETCH)
+                for entry in images:
+                    file_name = entry["file"]
+                    remaining[file_name] -= 1
+                    if file_name in shared:
+                        keyed = shared[file_name]
+                        if not remaining[file_name]:
+                            del shared[file_name]
+                    else:
+                        _, future = next(reads)
+                        keyed = future.result()
+                        if remaining[file_name]:
+                            shared[file_name] = keyed
+                    if keyed is None:
+                        print(f"Missing image entry in board: {file_name}")
                         continue
-            return True, images
-        except Exception as e:
-            return False, str(e)
+                    yield "image", self._make_image_record(entry, *keyed)
+        for group_data in manifest.get("groups", []):
+            yield "group", group_data
+
+    def _read_image_entry(self, zf, name):
+        """
+        读取一个图片条目为 (QByteArray, 缓存键)（可在工作线程中调用），条目缺失时返回 None
+        Read one image entry as (QByteArray, cache key) (callable on a worker thread), None if the entry is missing
+        """
+        try:
+            return _keyed(QByteArray(self._read_zip_entry(zf, name)))
+        except KeyError:
+            return None
+
+    def _read_zip_entry(self, zf, name):
+        """
+        读取 ZIP 条目，zstd 帧自动解压 / Read a ZIP entry, decompressing zstd frames transparently
+        """
+        data = zf.read(name)
+        if data.startswith(ZSTD_MAGIC):
+            data = _zstd_decompress(data)
+        return data
+
+    def _iter_legacy_json(self, path):
+        """
+        读取旧版 JSON 格式（纯数组或带版本号的对象），逐张解码 Base64 图片数据。
+        安装了 ijson 时流式解析，否则整体解析后逐条解码。
+        Read the legacy JSON layout (plain array or versioned object), decoding Base64 per image.
+        Streams with ijson when installed, otherwise parses once and decodes per item.
+        """
+        if _ijson() is not None:
+            images_data, groups_data = self._stream_legacy_json(path)
+        else:
+            # 内存映射整个文件并直接交给解析器，省去 read() 拷贝和 str 解码
+            # mmap the whole file and hand it to the parser, skipping the read() copy and str decode
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        data = _json_loads(view)
+
+            if isinstance(data, list):
+                # 旧版本格式（纯数组）/ Old format (pure array)
+                images_data = data
+                groups_data = []
+            else:
+                images_data = data.get("images", [])
+                groups_data = data.get("groups", [])
+
+        # 在工作线程中提前解码后续几张图片的 Base64，主线程按顺序取用
+        # Decode the Base64 of the next few images on worker threads; the main thread consumes them in order
+        with ThreadPoolExecutor(max_workers=BASE64_WORKERS) as executor:
+            images_data = (img_data for img_data in images_data if img_data.get("data"))
+            for img_data, future in _map_ordered(executor, lambda d: _keyed(_b64_decode(d["data"])),
+                                                 images_data, BASE64_PREFETCH):
+                try:
+                    img_bytes, key = future.result()
+                except Exception as decode_err:
+                    print(f"Error decoding image data: {decode_err}")
+                    continue
+                yield "image", self._make_image_record(img_data, img_bytes, key)
+        for group_data in groups_data:
+            yield "group", group_data
+
+    def _stream_legacy_json(self, path):
+        """
+        使用 ijson 惰性遍历旧版 JSON 的 images / groups 数组
+        Lazily walk the images / groups arrays of legacy JSON with ijson
+        """
+        with open(path, "rb") as f:
+            head = f.read(64).lstrip()
+        if head.startswith(b"["):
+            # 旧版本格式（纯数组）/ Old format (pure array)
+            return self._ijson_items(path, "item"), []
+        return self._ijson_items(path, "images.item"), self._ijson_items(path, "groups.item")
+
+    def _ijson_items(self, path, prefix):
+        """
+        逐项产出 JSON 数组元素 / Yield JSON array elements one by one
+        """
+        with open(path, "rb") as f:
+            # use_float=True 保持与 json 模块一致的 float 类型（而非 Decimal）
+            # use_float=True keeps float values consistent with the json module (not Decimal)
+            yield from _ijson().items(f, prefix, use_float=True)
+
+    def _make_image_record(self, entry, img_bytes, key=None):
+        """
+        统一构建图片记录字典 / Build a normalized image record dict
+        key: 图片字节的缓存键（bytes_cache_key）/ Cache key of the image bytes (bytes_cache_key)
+        """
+        return {
+            "x": entry.get("x", 0),
+            "y": entry.get("y", 0),
+            "scale": entry.get("scale", 1.0),
+            "rotation": entry.get("rotation", 0),
+            "zIndex": entry.get("zIndex", 0),  # 读取图层顺序 / Load layer order
+            "groupId": entry.get("groupId", None),
+            "width": entry.get("width"),       # 版本5起记录的原图尺寸 / Original size, recorded since version 5
+            "height": entry.get("height"),
+            "data": img_bytes,
+            "key": key
+        }
@@ -1,13 +1,16 @@
-import base64
 import uuid
-from PySide6.QtWidgets import (QGraphicsView, QGraphicsPixmapItem, QGraphicsItem, QStyleOptionGraphicsItem, 
+import math
+from PySide6.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QGraphicsItem, QStyleOptionGraphicsItem, 
                                QGraphicsRectItem, QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QLineEdit, QSpinBox, QSlider, QPushButton, QColorDialog, QInputDialog)
-from PySide6.QtCore import Qt, QByteArray, QBuffer, QPointF, QRectF, QMimeData, QLineF, QTimer
-from PySide6.QtGui import QPixmap, QImage, QPainter, QCursor, QColor, QPen, QDragEnterEvent, QDropEvent, QMouseEvent, QBrush, QFont, QPainterPath, QFontMetricsF
+                               QLineEdit, QSpinBox, QSlider, QPushButton, QColorDialog, QInputDialog, QApplication)
+from PySide6.QtCore import Qt, QPointF, QRectF, QSizeF, QMimeData, QTimer, QThreadPool
+from PySide6.QtGui import QPixmap, QPixmapCache, QImage, QPainter, QCursor, QColor, QPen, QDragEnterEvent, QDropEvent, QMouseEvent, QBrush, QFont, QPainterPath, QFontMetricsF, QPolygonF
 import bisect
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from Config import Config, tr
+from Models.ImageLoader import (bytes_cache_key, decode_image, file_stamp, to_display_image, wants_preview,
+                                ImageDecodeSignals, ImageDecodeTask, ImageScaleTask, DECODE_MAX_SIDE, DECODE_MIN_SIDE,
+                                PREVIEW_MAX_SIDE)
 
 # --- Group Settings Dialog ---
 class GroupSettingsDialog(QDialog):
@@ -504,31 +507,163 @@ class GroupItem(QGraphicsRectItem):
         }
 
 # --- Graphics Item ---
+# 图片内容摘要 -> 原图尺寸（命中 QPixmapCache 时无需再读文件头）
+# Content digest -> original size (no header probe needed on a QPixmapCache hit)
+_source_sizes = {}
+
+
+def pixmap_cache_key(source):
+    """
+    计算图片来源的缓存键：字节为内容摘要（BLAKE2b-128，直接读取 QByteArray 缓冲区），文件路径为 路径+大小+修改时间
+    Cache key of an image source: a content digest for bytes (BLAKE2b-128 over the QByteArray buffer),
+    path + size + mtime for a file path
+    """
+    if isinstance(source, str):
+        return "file:%s:%s" % (source, file_stamp(source))
+    return bytes_cache_key(source)
+
+
+def display_cache_key(key, max_side, color_depth_manager):
+    """
+    显示 pixmap 在 QPixmapCache 中的键 / QPixmapCache key of a display pixmap
+    解码上限与色深模式都会影响显示结果，一并计入缓存键 / Decode cap and color depth mode both change the result, so both are part of the key
+    """
+    return "%s:%d:%s" % (key, max_side, getattr(color_depth_manager, 'mode', None))
+
+
+def load_display_pixmap(source, max_side=DECODE_MAX_SIDE, key=None):
+    """
+    解码显示用 pixmap，经 QPixmapCache 缓存：相同字节（重复粘贴、看板中的重复图片、离屏释放后重新进入视野）只解码一次
+    Decode the display pixmap through QPixmapCache: identical bytes (repeated pastes, duplicates in a board,
+    re-entering view after eviction) are decoded only once
+    source: 图片字节 QByteArray 或文件路径 / Image bytes as QByteArray, or a file path
+    key: 已知的缓存键（省去重新计算）/ Known cache key (skips recomputing it)
+    返回 / Returns: (QPixmap, 原图尺寸 QSize / original QSize, 缓存键 / cache key)
+    """
+    if key is None:
+        key = pixmap_cache_key(source)
+    cdm = getattr(QApplication.instance(), 'color_depth_manager', None)
+    cache_key = display_cache_key(key, max_side, cdm)
+
+    pixmap = QPixmap()
+    source_size = _source_sizes.get(key)
+    if source_size is not None and QPixmapCache.find(cache_key, pixmap):
+        return pixmap, source_size, key
+
+    image, source_size = decode_image(source, max_side)
+    image = to_display_image(image, cdm)
+    pixmap = QPixmap.fromImage(image)
+    if not pixmap.isNull():
+        _source_sizes[key] = source_size
+        QPixmapCache.insert(cache_key, pixmap)
+    return pixmap, source_size, key
+
+
+def remember_display_pixmap(source, pixmap, source_size, max_side):
+    """
+    登记在别处（后台任务）解码好的显示 pixmap，之后离屏释放再进入视野或重复导入时直接命中缓存
+    Register a display pixmap decoded elsewhere (a background task), so re-entering view after
+    eviction or importing the same image again hits the cache
+    返回 / Returns: 缓存键 / cache key
+    """
+    key = pixmap_cache_key(source)
+    cdm = getattr(QApplication.instance(), 'color_depth_manager', None)
+    _source_sizes[key] = source_size
+    QPixmapCache.insert(display_cache_key(key, max_side, cdm), pixmap)
+    return key
+
+
+def load_item_pixmap(source, max_side=DECODE_MAX_SIDE, key=None):
+    """
+    为图片项取得首个可显示的 pixmap：已缓存的完整 pixmap 直接返回；可快速缩小解码的大图先解码低分辨率预览，
+    完整版本由调用方交给后台（RefItem.request_full_pixmap）；其余情况同步完整解码
+    Get the first displayable pixmap for an item: a cached full pixmap is returned as-is; large images that
+    scale cheaply decode a low-resolution preview first and the caller hands the full version to the
+    background (RefItem.request_full_pixmap); anything else is decoded fully right away
+    返回 / Returns: (QPixmap, 原图尺寸 / original QSize, 缓存键 / cache key, 是否为预览 / is preview)
+    """
+    if key is None:
+        key = pixmap_cache_key(source)
+    source_size = _source_sizes.get(key)
+    if source_size is not None:
+        cdm = getattr(QApplication.instance(), 'color_depth_manager', None)
+        pixmap = QPixmap()
+        if QPixmapCache.find(display_cache_key(key, max_side, cdm), pixmap):
+            return pixmap, source_size, key, False
+    if wants_preview(source, max_side):
+        return load_display_pixmap(source, PREVIEW_MAX_SIDE, key) + (True,)
+    return load_display_pixmap(source, max_side, key) + (False,)
+
+
 class RefItem(QGraphicsPixmapItem):
     """
     自定义图形项，用于显示图片 / Custom graphics item for displaying images
     """
-    def __init__(self, pixmap, data=None):
+    # 选中手柄超出图片边缘的屏幕像素（半径 5px + 2px 描边的一半 + 抗锯齿余量）
+    # Screen pixels the selection handles extend past the image edge (5px radius + half of 2px pen + AA slack)
+    HANDLE_SCREEN_MARGIN = 7
+    # 手柄外扩的余量倍数：外扩保持在所需值的 [1, SLACK²] 倍内时不更新 / Slack factor for handle padding: kept while within [1, SLACK²] of what is needed
+    HANDLE_MARGIN_SLACK = 2.0
+    # 离屏释放后占位用的共享 1×1 pixmap（首次使用时创建）/ Shared 1×1 placeholder pixmap after off-screen eviction (created on first use)
+    _tiny_proxy = None
+    # 后台解码完成前的占位填充色 / Fill shown in place of an image until its background decode finishes
+    LOADING_COLOR = QColor(128, 128, 128, 48)
+    # 图片无法解码时的占位填充色 / Fill shown in place of an image that could not be decoded
+    ERROR_COLOR = QColor(200, 60, 60, 96)
+    # 不生成 mip 级别的 pixmap 最长边（小图直接采样代价很低）/ Longest pixmap side without mip levels (small images are cheap to sample directly)
+    MIP_MIN_SIDE = 256
+
+    def __init__(self, pixmap, data=None, source_size=None, pixmap_key=None, source_path=None):
         """
         初始化图片项，设置标志和变换模式 / Initialize image item, set flags and transformation mode
+        source_size: 原图像素尺寸；大图可能以缩小的分辨率解码，图片项的几何仍按原图尺寸计算
+                     Original pixel size; large images may be decoded at reduced resolution while
+                     the item's geometry still follows the original size
+        pixmap_key: 图片来源的 QPixmapCache 键，未知时在首次重新解码时计算
+                    QPixmapCache key of the image source, computed on first re-decode if unknown
+        source_path: 从文件导入的图片不在内存中保留原始字节，重新解码与保存时直接读取源文件
+                     Images imported from files keep no bytes in memory; re-decodes and saves read the source file
         """
         super().__init__(pixmap)
-        self.image_data = data # QByteArray or bytes
+        self.image_data = data # QByteArray（无原始字节时为 None / None without original bytes）
+        self.source_path = source_path
+        # 导入时源文件的 (大小, 修改时间)，用于判断文件是否已被改动 / Source file (size, mtime) at import, to detect later changes
+        self._source_stamp = file_stamp(source_path) if source_path else None
+        self._pixmap_key = pixmap_key
+        self._source_size = QSizeF(source_size) if source_size is not None else QSizeF(pixmap.size())
+        
+        # 所属场景/视图缓存（在 ItemSceneHasChanged 时更新），事件处理中无需反复查询
+        # Owning scene/view cache (updated on ItemSceneHasChanged) so event handlers skip repeated lookups
+        self._scene = None
+        self._view = None
+        
+        # 视图缩放共享引用（由 RefView 在缩放时更新）/ Shared view-scale reference (updated by RefView on zoom)
+        self._view_scale_ref = None
+        
+        # 选中时为手柄预留的边界外扩（本地坐标）/ Bounding rect padding reserved for handles while selected (local coords)
+        self._handle_margin = 0.0
+        
+        # 几何缓存：以原点为中心的逻辑矩形与四角，与显示用 pixmap 的分辨率无关
+        # Geometry cache: origin-centred logical rect and corners, independent of the display pixmap's resolution
+        self._refresh_geometry_cache()
+        
         self.setFlags(QGraphicsItem.ItemIsMovable | QGraphicsItem.ItemIsSelectable | QGraphicsItem.ItemSendsGeometryChanges)
         self.setTransformationMode(Qt.SmoothTransformation) # High quality scaling on GPU
-        self.setShapeMode(QGraphicsPixmapItem.BoundingRectShape)
         self.setAcceptHoverEvents(True)
-        
-        # Center the origin
-        self.setOffset(-pixmap.width()/2, -pixmap.height()/2)
+        # 不使用项缓存（NoCache）：绘制只是一次 drawPixmap（缩小时采样 mip 级别），设备坐标缓存只会多存一份按屏幕尺寸的副本，
+        # 每次缩放都要失效重建，并与解码后的 pixmap 争用 QPixmapCache
+        # No item cache (NoCache): painting is a single drawPixmap (sampling a mip level when zoomed out), so a
+        # device-coordinate cache would only keep a second, screen-sized copy that is rebuilt on every zoom step
+        # and competes with the decoded pixmaps for QPixmapCache
 
         # Resize state
         self._is_resizing = False
         self._resize_corner = None
-        self._start_pos = None
-        self._start_scale = 1.0
+        self._resize_targets = ()
         self._start_mouse_pos = None
         self._anchor_scene_pos = None
+        self._inv_start_dist = None
+        self._margin_floor = 1.0
         
         # Undo state: 记录拖动/缩放开始前的状态 / Record state before drag/scale
         self._undo_start_pos = None
@@ -537,37 +672,325 @@ class RefItem(QGraphicsPixmapItem):
         
         # 组ID / Group ID
         self.group_id = None
+        
+        # LOD 缓存：离屏过久时释放已解码的 pixmap，仅保留压缩字节
+        # LOD cache: drop the decoded pixmap after staying off-screen, keeping only the compressed bytes
+        self._evicted = False
+        self._offscreen_ticks = 0
+        # 当前显示的是低分辨率预览，完整 pixmap 正在后台解码 / Showing a low-res preview while the full pixmap decodes in the background
+        self._preview_only = False
+        # 后台与同步解码均失败：显示错误占位，不再释放或重新排队解码 / Background and synchronous decodes both failed:
+        # the error placeholder is shown and the item is never evicted or queued for decoding again
+        self._decode_failed = False
+
+    def _refresh_geometry_cache(self):
+        """
+        刷新边界矩形、四角与形状缓存 / Refresh cached bounding rect, corners and shape
+        """
+        self.prepareGeometryChange()
+        w = self._source_size.width()
+        h = self._source_size.height()
+        self._br = QRectF(-w / 2, -h / 2, w, h)  # Center the origin
+        self._corners = (self._br.topLeft(), self._br.topRight(), self._br.bottomLeft(), self._br.bottomRight())
+        m = self._handle_margin
+        self._bounding = self._br.adjusted(-m, -m, m, m)
+        self._shape = QPainterPath()
+        self._shape.addRect(self._br)
+
+    def source_size(self):
+        """
+        原图像素尺寸（逻辑尺寸）/ Original pixel size (logical size)
+        """
+        return QSizeF(self._source_size)
+
+    def shape(self):
+        """
+        形状为图片逻辑矩形（不含手柄），用于命中测试 / Shape is the logical image rect (no handles), used for hit testing
+        """
+        return self._shape
+
+    def _updateHandleMargin(self, scale=None):
+        """
+        根据选中状态与当前缩放更新手柄外扩，使局部重绘能覆盖整个手柄
+        Update handle padding from selection state and current zoom so partial repaints cover the handles
+        scale: 按指定缩放计算（缩放拖拽期间预留余量），默认使用当前缩放
+               Compute for this scale instead of the current one (headroom during resize drags)
+        """
+        margin = 0.0
+        if self.isSelected():
+            screen_scale = (self.scale() if scale is None else scale) * self._view_scale()
+            if screen_scale > 1e-5:
+                needed = self.HANDLE_SCREEN_MARGIN / screen_scale
+                # 留出余量并带回差：滚轮缩放时不必每一格都对所有选中项 prepareGeometryChange（触发索引更新）；
+                # 外扩只影响重绘区域，命中测试使用不含手柄的 shape()
+                # Padded with slack and hysteresis so wheel zooming need not prepareGeometryChange (an index update)
+                # every selected item on every notch; the padding only widens repaint regions, hit testing uses shape()
+                current = self._handle_margin
+                if needed <= current <= needed * self.HANDLE_MARGIN_SLACK ** 2:
+                    return
+                margin = needed * self.HANDLE_MARGIN_SLACK
+        if margin != self._handle_margin:
+            self.prepareGeometryChange()
+            self._handle_margin = margin
+            self._bounding = self._br.adjusted(-margin, -margin, margin, margin)
+
+    def boundingRect(self):
+        """
+        边界矩形：选中时包含超出图片边缘的手柄，保证 SmartViewportUpdate 下无残影
+        Bounding rect: includes handles past the image edge while selected, so SmartViewportUpdate leaves no ghosting
+        """
+        return self._bounding
+
+    def sceneBoundingRect(self):
+        """
+        图片本身在场景中的矩形（不含手柄外扩），供吸附/分组/画板边界等几何计算使用；
+        Qt 内部的更新区域与索引仍使用含手柄的 boundingRect()
+        The image's own scene rect (without handle padding) for snapping/grouping/board-bounds geometry;
+        Qt's internal update regions and index still use the handle-padded boundingRect()
+        """
+        return self.mapRectToScene(self._br)
+
+    def itemChange(self, change, value):
+        """
+        选中状态或缩放变化时刷新手柄外扩；加入/移出场景时刷新场景与视图缓存
+        Refresh handle padding when selection or scale changes; refresh the scene/view cache
+        when added to or removed from a scene
+        """
+        if change == QGraphicsItem.ItemSelectedHasChanged or change == QGraphicsItem.ItemScaleHasChanged:
+            self._updateHandleMargin()
+        elif change == QGraphicsItem.ItemSceneHasChanged:
+            old_view = self._view
+            self._scene = value
+            views = value.views() if value is not None else []
+            self._view = views[0] if views else None
+            self._view_scale_ref = getattr(self._view, '_view_scale_ref', None)
+            # 通知视图维护图片集合，并据数量切换场景索引方式 / Tell the views so they keep their image set and switch the scene index method
+            if old_view is not None and hasattr(old_view, '_refItemSceneChanged'):
+                old_view._refItemSceneChanged(self, False)
+            if self._view is not None and hasattr(self._view, '_refItemSceneChanged'):
+                self._view._refItemSceneChanged(self, True)
+        return super().itemChange(change, value)
+
+    def evict_pixmap(self):
+        """
+        释放已解码的 pixmap，以 1×1 占位替代（需要原始字节才能重新解码）
+        Free the decoded pixmap and substitute a 1×1 placeholder (requires raw bytes or an unchanged source file to re-decode)
+        """
+        if self._evicted or self._decode_failed or (self.image_data is None and not self.source_file_valid()):
+            return
+        self._evicted = True
+        self._preview_only = False
+        self.setPixmap(RefItem._placeholder())
+
+    @classmethod
+    def _placeholder(cls):
+        """
+        共享的 1×1 透明占位 pixmap / Shared 1×1 transparent placeholder pixmap
+        """
+        if cls._tiny_proxy is None:
+            RefItem._tiny_proxy = QPixmap(1, 1)
+            RefItem._tiny_proxy.fill(Qt.transparent)
+        return cls._tiny_proxy
+
+    @classmethod
+    def deferred(cls, data, source_size, source_path=None, pixmap_key=None):
+        """
+        创建尚未解码的图片项：以占位 pixmap 按原图尺寸入场，首次绘制（进入视野）时才解码
+        Create an item that is not decoded yet: it enters the scene with the placeholder at its original
+        size and is only decoded when first painted (scrolled into view)
+        pixmap_key: 加载时已算好的缓存键，首次绘制时不必在主线程中对整张图片求摘要
+                    Cache key computed while loading, so the first paint need not digest the whole image on the GUI thread
+        """
+        item = cls(cls._placeholder(), data, source_size, pixmap_key, source_path)
+        item._evicted = True
+        return item
+
+    def _swap_in_pixmap(self, pixmap, preview=False):
+        """
+        换回重新解码的 pixmap（若期间又被释放则忽略；完整 pixmap 已先到达时忽略预览）
+        Swap the re-decoded pixmap back in (ignored if evicted again meanwhile; a preview is ignored
+        once the full pixmap has arrived)
+        """
+        if self._evicted or (preview and not self._preview_only):
+            return
+        if not preview:
+            self._preview_only = False
+        self.setPixmap(pixmap)
+
+    def _fallback_decode(self):
+        """
+        后台解码失败：同步重试一次；仍然失败时标记为解码失败（有预览则保留预览，否则显示错误占位）
+        Background decode failed: retry once synchronously; if that fails too, mark the item as failed
+        (keeping its preview if it has one, the error placeholder otherwise)
+        """
+        if self._evicted or not self._preview_only:
+            return
+        self._preview_only = False
+        pixmap = self._decodePixmap()
+        if pixmap.isNull():
+            print(f"Failed to decode image: {self.source_path or 'embedded data'}")
+            self._decode_failed = True
+            self.update()
+            return
+        self.setPixmap(pixmap)
+
+    def request_full_pixmap(self):
+        """
+        当前显示预览或占位：把完整分辨率的解码交给视图的后台线程（缓存查找、文件头检测与预览解码都不在主线程），完成后自动替换
+        Showing a preview or the placeholder: hand the full-resolution decode to the view's background threads
+        (cache lookup aside, header probes and preview decodes stay off the GUI thread), swapped in when done
+        """
+        self._evicted = False
+        self._offscreen_ticks = 0
+        self._preview_only = True
+        view = self._view
+        if view is not None and hasattr(view, 'requestDecode'):
+            source = self._decodeSource()
+            if self._pixmap_key is None:
+                self._pixmap_key = pixmap_cache_key(source)
+            placeholder = self.pixmap().cacheKey() == RefItem._placeholder().cacheKey()
+            view.requestDecode(self, source, self._pixmap_key, self._decodeMaxSide(), preview=placeholder)
+
+    def source_file_valid(self):
+        """
+        源文件是否仍是导入时的内容 / Whether the source file still holds the imported content
+        """
+        return self.source_path is not None and file_stamp(self.source_path) == self._source_stamp
+
+    def has_full_copy(self):
+        """
+        能否保存完整分辨率的图片：有原始字节、源文件未改动，或当前显示的 pixmap 即原图（未缩小解码，如粘贴的图片）
+        Whether the image can be saved at full resolution: raw bytes, an unchanged source file, or a displayed
+        pixmap that is the original image itself (not decoded scaled down, e.g. a pasted image)
+        """
+        if self.image_data is not None or self.source_file_valid():
+            return True
+        if self._evicted or self._preview_only:
+            return False
+        size = self.pixmap().size()
+        return size.width() >= self._source_size.width() and size.height() >= self._source_size.height()
+
+    def full_pixmap(self):
+        """
+        返回完整分辨率的显示 pixmap，必要时重新解码 / Return the full display pixmap, re-decoding if evicted or still a preview
+        """
+        if self._evicted or self._preview_only:
+            self._evicted = False
+            self._preview_only = False
+            self.setPixmap(self._decodePixmap())
+        return self.pixmap()
+
+    def _decodeSource(self):
+        """
+        解码来源：原始字节，或无字节时的源文件路径 / Decode source: the raw bytes, or the source file path without them
+        """
+        return self.image_data if self.image_data is not None else self.source_path
+
+    def _decodePixmap(self):
+        """
+        从原始字节或源文件重新解码显示用 pixmap（经 QPixmapCache）/ Re-decode the display pixmap from raw bytes or the source file (through QPixmapCache)
+        """
+        pixmap, _, self._pixmap_key = load_display_pixmap(self._decodeSource(), self._decodeMaxSide(), self._pixmap_key)
+        return pixmap
+
+    def _mipPixmap(self, pixmap, lod):
+        """
+        按屏幕上的缩小倍数选用 pixmap 的 mip 级别：缩到一半以下时改为绘制预先平滑缩小的共享版本，
+        缩放重绘时 GPU 只需采样与屏幕尺寸相近的纹理，而不是整张原图
+        Pick a mip level of the pixmap from its on-screen reduction: below half size, a shared pre-smoothed
+        reduction is drawn instead, so zoom repaints sample a texture close to screen size rather than the full image
+        """
+        side = max(pixmap.width(), pixmap.height())
+        if side <= self.MIP_MIN_SIDE:
+            return pixmap
+        ratio = max(self._br.width(), self._br.height()) * lod / side
+        if ratio >= 0.5:
+            return pixmap
+        view = self._view
+        if view is None or not hasattr(view, 'mipPixmap'):
+            return pixmap
+        # 边长至少减半 level 次仍不小于屏幕尺寸 / Halving the sides level times still stays at or above screen size
+        level = min(int(-math.log2(ratio)), int(math.log2(side)))
+        return view.mipPixmap(self, pixmap, level)
+
+    def _decodeMaxSide(self):
+        """
+        重新解码时的最长边上限（由所属视图按视口尺寸决定）/ Longest-side cap for re-decodes (set by the owning view from its viewport size)
+        """
+        view = self._view
+        if view is not None and hasattr(view, 'decodeMaxSide'):
+            return view.decodeMaxSide()
+        return DECODE_MAX_SIDE
+
+    def _view_scale(self):
+        """
+        读取视图缩放共享引用，首次访问时从视图获取 / Read the shared view-scale reference, fetched from the view on first access
+        """
+        ref = self._view_scale_ref
+        if ref is None:
+            view = self._view
+            if view is None or not hasattr(view, '_view_scale_ref'):
+                return 1.0
+            ref = self._view_scale_ref = view._view_scale_ref
+        return ref[0]
 
     def paint(self, painter, option, widget=None):
         """
         绘制图片项和选中框 / Paint image item and selection border
         """
-        super().paint(painter, option, widget)
+        # 将 pixmap 拉伸绘制到逻辑矩形中：缩小解码的大图仍以原尺寸显示
+        # Stretch the pixmap into the logical rect so images decoded at reduced size keep their original size
+        if self._evicted:
+            # 重新进入视野：只排队解码（缓存命中、预览与完整图都在绘制流程之外换入），本次先画占位
+            # Back in view: only queue the decode (cache hits, previews and full images are all swapped in
+            # outside the paint pass); the placeholder is drawn this time
+            self.request_full_pixmap()
+        pixmap = self.pixmap()
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < 0.00001: lod = 1
+        if (self._preview_only or self._decode_failed) and pixmap.cacheKey() == RefItem._placeholder().cacheKey():
+            # 后台解码尚未完成：以浅色块标出图片位置；解码失败时改为红色块
+            # Background decode still running: a faint block marks the image; a red block once decoding failed
+            painter.fillRect(self._br, self.ERROR_COLOR if self._decode_failed else self.LOADING_COLOR)
+        else:
+            pixmap = self._mipPixmap(pixmap, lod)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, self.transformationMode() == Qt.SmoothTransformation)
+            painter.drawPixmap(self._br, pixmap, QRectF(pixmap.rect()))
         
-        if self.isSelected():
-            # Draw selection border
-            pen = QPen(QColor("#2a82da"))
-            pen.setWidth(2)
-            pen.setCosmetic(True)
-            painter.setPen(pen)
-            painter.setBrush(Qt.NoBrush)
-            
-            rect = self.boundingRect()
-            painter.drawRect(rect)
-            
-            # Draw handles
-            painter.setBrush(QColor("white"))
-            
-            # Calculate handle size to be constant on screen
-            lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
-            if lod < 0.00001: lod = 1
-            
-            handle_dia = 10 / lod
-            radius = handle_dia / 2
-            
-            corners = [rect.topLeft(), rect.topRight(), rect.bottomLeft(), rect.bottomRight()]
-            for corner in corners:
-                painter.drawEllipse(corner, radius, radius)
+        if not self.isSelected():
+            return
+
+        # Calculate handle size to be constant on screen
+
+        # 图片在屏幕上的最长边（像素）：不足 1px 时选中框不可见，直接跳过
+        # On-screen longest side in pixels: below 1px the selection is invisible, skip it
+        screen_extent = max(self._br.width(), self._br.height()) * lod
+        if screen_extent < 1:
+            return
+
+        # Draw selection border
+        pen = QPen(QColor("#2a82da"))
+        pen.setWidth(2)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+
+        painter.drawRect(self._br)
+
+        # 手柄为固定屏幕尺寸：图片缩到比两个手柄还小时手柄会完全盖住图片，此时只画边框
+        # Handles have a fixed screen size: once the image is smaller than two handles they would
+        # cover it entirely, so only the border is drawn
+        handle_dia = 10 / lod
+        if screen_extent < 20:
+            return
+
+        # Draw handles（合并为一条路径，一次绘制调用 / batched into one path, a single draw call）
+        painter.setBrush(QColor("white"))
+        radius = handle_dia / 2
+        handles = QPainterPath()
+        for corner in self._corners:
+            handles.addEllipse(corner, radius, radius)
+        painter.drawPath(handles)
 
     def hoverMoveEvent(self, event):
         """
@@ -576,22 +999,15 @@ class RefItem(QGraphicsPixmapItem):
         # Detect corners for resizing
         if self.isSelected():
             pos = event.pos()
-            rect = self.boundingRect()
             
             # Calculate margin in local coordinates to match constant screen size
-            views = self.scene().views()
-            view_scale = 1.0
-            if views:
-                view_scale = views[0].transform().m11()
+            view_scale = self._view_scale()
             
             # Desired screen margin (e.g., 20px)
             screen_margin = 20
             margin = screen_margin / (self.scale() * view_scale)
             
-            tl = rect.topLeft()
-            tr = rect.topRight()
-            bl = rect.bottomLeft()
-            br = rect.bottomRight()
+            tl, tr, bl, br = self._corners
             
             if (pos - tl).manhattanLength() < margin:
                 self.setCursor(Qt.SizeFDiagCursor)
@@ -623,7 +1039,7 @@ class RefItem(QGraphicsPixmapItem):
             self._start_mouse_pos = event.scenePos()
             
             # Calculate Group Bounding Rect
-            selected_items = self.scene().selectedItems()
+            selected_items = self._scene.selectedItems()
             group_rect = QRectF()
             for item in selected_items:
                 if isinstance(item, RefItem):
@@ -640,19 +1056,41 @@ class RefItem(QGraphicsPixmapItem):
             elif self._resize_corner == "br":
                 self._anchor_scene_pos = group_rect.topLeft()
             
+            # 缓存起始距离的倒数：移动时只需一次 sqrt / Cache inverse start distance: one sqrt per move
+            dx = self._anchor_scene_pos.x() - self._start_mouse_pos.x()
+            dy = self._anchor_scene_pos.y() - self._start_mouse_pos.y()
+            start_d2 = dx * dx + dy * dy
+            self._inv_start_dist = 1.0 / math.sqrt(start_d2) if start_d2 >= 1e-10 else None
+            
             # Store start scale and pos for all selected items (including undo state)
             # 同时记录初始联合边界用于缩放吸附 / Also record initial union bounds for resize snap
+            # 缩放目标一次性缓存为 (item, 起始缩放, 相对锚点的起始向量)，移动时无需重新扫描选区
+            # Resize targets are cached once as (item, start scale, start vector from anchor),
+            # so moves never re-scan the selection
             self._resize_start_group_rect = QRectF(group_rect)
+            targets = []
             for item in selected_items:
                 if isinstance(item, RefItem):
-                    item._start_scale = item.scale()
-                    item._start_pos = item.scenePos()
+                    targets.append((item, item.scale(), item.scenePos() - self._anchor_scene_pos))
                     # 记录撤销状态 / Record undo state
                     item._undo_start_pos = QPointF(item.pos())
                     item._undo_start_scale = item.scale()
+            self._resize_targets = tuple(targets)
+            if hasattr(self._view, 'beginItemTransform'):
+                self._view.beginItemTransform(len(targets))
+            
+            # 缩放期间关闭几何变化通知：每帧 setScale/setPos 不再为每个图片触发 itemChange；
+            # 手柄外扩按一半缩放预留余量，只在继续缩小越过余量时才重新计算
+            # Turn off geometry change notifications while resizing so per-frame setScale/setPos no longer
+            # run itemChange for every item; handle padding is sized for half the scale and only
+            # recomputed when the drag shrinks past that headroom
+            self._margin_floor = 0.5
+            for item, start_scale, _ in self._resize_targets:
+                item.setFlag(QGraphicsItem.ItemSendsGeometryChanges, False)
+                item._updateHandleMargin(start_scale * self._margin_floor)
             
             # [Smart Guides] 缩放开始时缓存参考线 / Cache guide lines at resize start
-            view = self.scene().views()[0] if self.scene().views() else None
+            view = self._view
             if view and hasattr(view, '_snap_enabled') and view._snap_enabled:
                 dragged_ids = set()
                 for it in selected_items:
@@ -664,14 +1102,16 @@ class RefItem(QGraphicsPixmapItem):
         elif event.button() == Qt.LeftButton:
             # 记录拖动开始状态（用于撤销）/ Record drag start state (for undo)
             self._is_dragging = True
-            selected_items = self.scene().selectedItems()
+            selected_items = self._scene.selectedItems()
             for item in selected_items:
                 if isinstance(item, RefItem):
                     item._undo_start_pos = QPointF(item.pos())
                     item._undo_start_scale = item.scale()
+            if hasattr(self._view, 'beginItemTransform'):
+                self._view.beginItemTransform(len(selected_items))
             
             # [Smart Guides] 拖拽开始时缓存参考线 / Cache guide lines at drag start
-            view = self.scene().views()[0] if self.scene().views() else None
+            view = self._view
             if view and hasattr(view, '_snap_enabled') and view._snap_enabled:
                 dragged_ids = set()
                 for it in selected_items:
@@ -688,33 +1128,38 @@ class RefItem(QGraphicsPixmapItem):
         处理鼠标移动事件，执行调整大小 / Handle mouse move, perform resizing
         """
         if self._is_resizing:
+            inv_start = self._inv_start_dist
+            if inv_start is None: return
+            anchor = self._anchor_scene_pos
             current_mouse_pos = event.scenePos()
             
             # Calculate scale factor based on distance from anchor
-            start_dist = QLineF(self._anchor_scene_pos, self._start_mouse_pos).length()
-            current_dist = QLineF(self._anchor_scene_pos, current_mouse_pos).length()
-            
-            if start_dist < 1e-5: return
-            
-            ratio = current_dist / start_dist
+            dx = anchor.x() - current_mouse_pos.x()
+            dy = anchor.y() - current_mouse_pos.y()
+            ratio = math.sqrt(dx * dx + dy * dy) * inv_start
             
             # [Smart Guides] 缩放时参考线吸附 / Snap during resize
-            view = self.scene().views()[0] if self.scene().views() else None
+            view = self._view
             if view and hasattr(view, '_snap_enabled') and view._snap_enabled:
                 start_rect = getattr(self, '_resize_start_group_rect', None)
                 if start_rect is not None:
                     ratio = view._performResizeSnap(
-                        ratio, self._anchor_scene_pos, start_rect, self._resize_corner
+                        ratio, anchor, start_rect, self._resize_corner
                     )
             
+            # 缩小越过手柄余量时再预留一半 / Shrunk past the handle headroom: reserve another half
+            targets = self._resize_targets
+            if ratio < self._margin_floor:
+                self._margin_floor = ratio * 0.5
+                for item, start_scale, _ in targets:
+                    item._updateHandleMargin(start_scale * self._margin_floor)
+            
             # Apply to all selected items (Unified Scaling)
-            for item in self.scene().selectedItems():
-                if isinstance(item, RefItem) and hasattr(item, '_start_scale'):
-                    # Scale
-                    item.setScale(item._start_scale * ratio)
-                    # Position: anchor + (start_pos - anchor) * ratio
-                    vec = item._start_pos - self._anchor_scene_pos
-                    item.setPos(self._anchor_scene_pos + vec * ratio)
+            for item, start_scale, vec in targets:
+                # Scale
+                item.setScale(start_scale * ratio)
+                # Position: anchor + (start_pos - anchor) * ratio
+                item.setPos(anchor + vec * ratio)
             
             event.accept()
         else:
@@ -722,7 +1167,7 @@ class RefItem(QGraphicsPixmapItem):
             super().mouseMoveEvent(event)
             
             if self._is_dragging:
-                view = self.scene().views()[0] if self.scene().views() else None
+                view = self._view
                 if view and hasattr(view, '_snap_enabled') and view._snap_enabled:
                     view._performSnap(self)
 
@@ -732,7 +1177,9 @@ class RefItem(QGraphicsPixmapItem):
         """
         # [Smart Guides] 清除辅助线 / Clear guide lines on release
         if self._is_dragging or self._is_resizing:
-            view = self.scene().views()[0] if self.scene().views() else None
+            view = self._view
+            if hasattr(view, 'endItemTransform'):
+                view.endItemTransform()
             if view and hasattr(view, '_active_snap_lines'):
                 view._active_snap_lines = []
                 view._snap_x_guides = []
@@ -745,12 +1192,12 @@ class RefItem(QGraphicsPixmapItem):
             self.setCursor(Qt.ArrowCursor)
             
             # 创建缩放撤销命令 / Create scale undo command
-            view = self.scene().views()[0] if self.scene().views() else None
+            view = self._view
             if view and hasattr(view, 'parent') and view.parent():
                 main_window = view.parent()
                 if hasattr(main_window, 'record_scale_action'):
                     items_data = []
-                    for item in self.scene().selectedItems():
+                    for item in self._scene.selectedItems():
                         if isinstance(item, RefItem) and item._undo_start_scale is not None:
                             # 只有当缩放确实改变时才记录
                             if abs(item._undo_start_scale - item.scale()) > 0.001 or \
@@ -765,16 +1212,20 @@ class RefItem(QGraphicsPixmapItem):
                     if items_data:
                         main_window.record_scale_action(items_data)
             
+            # 恢复几何变化通知，并按最终缩放刷新手柄外扩 / Restore geometry notifications and refresh handle padding for the final scale
+            for item, _, _ in self._resize_targets:
+                item.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+                item._updateHandleMargin()
+            
             # Clean up temp attributes
-            for item in self.scene().selectedItems():
+            self._resize_targets = ()
+            for item in self._scene.selectedItems():
                 if isinstance(item, RefItem):
-                    if hasattr(item, '_start_scale'): del item._start_scale
-                    if hasattr(item, '_start_pos'): del item._start_pos
                     item._undo_start_pos = None
                     item._undo_start_scale = None
             
             # 缩放完成后标记画板边界需要更新 / Mark board bounds dirty after scale
-            view = self.scene().views()[0] if self.scene().views() else None
+            view = self._view
             if view and hasattr(view, 'markBoardBoundsDirty'):
                 view.markBoardBoundsDirty()
                 view.scheduleViewportUpdate()
@@ -784,12 +1235,12 @@ class RefItem(QGraphicsPixmapItem):
             self._is_dragging = False
             
             # 创建移动撤销命令 / Create move undo command
-            view = self.scene().views()[0] if self.scene().views() else None
+            view = self._view
             if view and hasattr(view, 'parent') and view.parent():
                 main_window = view.parent()
                 if hasattr(main_window, 'record_move_action'):
                     items_data = []
-                    for item in self.scene().selectedItems():
+                    for item in self._scene.selectedItems():
                         if isinstance(item, RefItem) and item._undo_start_pos is not None:
                             # 只有当位置确实改变时才记录
                             if (item._undo_start_pos - item.pos()).manhattanLength() > 1:
@@ -802,13 +1253,13 @@ class RefItem(QGraphicsPixmapItem):
                         main_window.record_move_action(items_data)
             
             # 清理撤销状态 / Clean up undo state
-            for item in self.scene().selectedItems():
+            for item in self._scene.selectedItems():
                 if isinstance(item, RefItem):
                     item._undo_start_pos = None
                     item._undo_start_scale = None
             
             # 拖拽/缩放完成后标记画板边界需要更新 / Mark board bounds dirty after drag/scale
-            view = self.scene().views()[0] if self.scene().views() else None
+            view = self._view
             if view and hasattr(view, 'markBoardBoundsDirty'):
                 view.markBoardBoundsDirty()
                 view.scheduleViewportUpdate()
@@ -825,7 +1276,7 @@ class RefItem(QGraphicsPixmapItem):
         
         # Re-position to keep anchor fixed
         # We need to know where the anchor point is NOW in scene coords
-        rect = self.boundingRect()
+        rect = self._br
         if self._resize_corner == "tl":
             anchor_local = rect.bottomRight()
         elif self._resize_corner == "tr":
@@ -843,23 +1294,27 @@ class RefItem(QGraphicsPixmapItem):
 
     def to_dict(self):
         """
-        将图片信息序列化为字典，用于保存 / Serialize image info to dict for saving
+        将图片信息序列化为字典，用于保存（data 为原始图片字节 QByteArray；从文件导入的图片改为给出 path，由保存时读取；
+        没有原始字节的图片给出 image（QImage 快照），由保存任务在工作线程中编码）
+        Serialize image info to dict for saving (data is the raw image QByteArray; images imported from
+        files give a path instead, read when the board is written; images without original bytes give an
+        image QImage snapshot that the save task encodes on a worker)
         """
         pos = self.scenePos()
-        # 惰性编码：image_data 为 None 时从 pixmap 生成 PNG bytes
-        # Lazy encoding: generate PNG bytes from pixmap when image_data is None
+        path = None
+        image = None
         if self.image_data is None:
-            ba = QByteArray()
-            buf = QBuffer(ba)
-            buf.open(QBuffer.WriteOnly)
-            self.pixmap().save(buf, "PNG")
-            self.image_data = ba.data()
-        
-        # Convert bytes/QByteArray to base64 string
-        if isinstance(self.image_data, QByteArray):
-            b64_data = self.image_data.toBase64().data().decode('utf-8')
-        else:
-            b64_data = base64.b64encode(self.image_data).decode('utf-8')
+            if self.source_file_valid():
+                path = self.source_path
+            else:
+                # 惰性编码：QPixmap 只能在主线程转换为 QImage，编码本身交给保存任务；
+                # 缩小解码的 pixmap 不能代替原图保存（调用方先以 has_full_copy() 检查）
+                # Lazy encoding: QPixmap → QImage must happen on the main thread, the encode itself is left to the
+                # save task; a pixmap decoded scaled down must never stand in for the original (callers check
+                # has_full_copy() first)
+                if not self.has_full_copy():
+                    raise ValueError(f"Source file changed or missing: {self.source_path}")
+                image = self.full_pixmap().toImage()
 
         return {
             "x": pos.x(),
@@ -867,7 +1322,12 @@ class RefItem(QGraphicsPixmapItem):
             "scale": self.scale(),
             "rotation": self.rotation(),
             "zIndex": self.zValue(),  # 保存图层顺序 / Save layer order
-            "data": b64_data,
+            "data": self.image_data,
+            "path": path,
+            "image": image,
+            # 原图尺寸：加载时无需读取文件头即可按原尺寸放置 / Original size: loading places the item without reading the header
+            "width": int(self._source_size.width()),
+            "height": int(self._source_size.height()),
             "groupId": self.group_id  # 保存组ID / Save group ID
         }
 
@@ -876,6 +1336,12 @@ class RefView(QGraphicsView):
     """
     自定义图形视图，支持 GPU 加速和交互 / Custom graphics view, supports GPU acceleration and interaction
     """
+    # 场景索引切换阈值（图片数量，带回差避免来回重建）/ Scene index switch thresholds (image count, with hysteresis to avoid rebuild churn)
+    BSP_INDEX_THRESHOLD = 500   # 超过后启用 BSP 索引 / Above this, use the BSP index
+    NO_INDEX_THRESHOLD = 400    # 低于后关闭索引 / Below this, drop the index
+    TRANSFORM_UNINDEX_MIN = 64  # 拖拽/缩放的图片数达到后暂停索引 / Suspend the index when a drag/resize moves this many images
+    BSP_MAX_DEPTH = 18          # BSP 树深度上限（2^18 个叶子）/ BSP tree depth cap (2^18 leaves)
+
     def __init__(self, scene, parent=None):
         """
         初始化视图，启用 OpenGL，设置渲染提示和交互模式 / Initialize view, enable OpenGL, set render hints and interaction modes
@@ -885,16 +1351,12 @@ class RefView(QGraphicsView):
         # GPU 加速 / GPU Acceleration
         # 始终使用 QOpenGLWidget 以获得 GPU 加速渲染
         # Always use QOpenGLWidget for GPU-accelerated rendering
-        gl_widget = QOpenGLWidget()
         if Config.acrylic_enabled:
-            # 亚克力模式：在 QOpenGLWidget 上启用透明穿透
-            # Acrylic mode: enable transparent passthrough on QOpenGLWidget
             # 需要 QSurfaceFormat alphaBufferSize >= 8（在 App.py 中已配置）
             # Requires QSurfaceFormat alphaBufferSize >= 8 (configured in App.py)
             self.setAttribute(Qt.WA_TranslucentBackground, True)
-            gl_widget.setAttribute(Qt.WA_TranslucentBackground, True)
             self.setStyleSheet("background: transparent; border: 0px;")
-        self.setViewport(gl_widget)
+        self.setViewport(self._createViewport(Config.acrylic_enabled))
         
         # Render Hints
         self.setRenderHint(QPainter.Antialiasing)
@@ -902,10 +1364,14 @@ class RefView(QGraphicsView):
         self.setRenderHint(QPainter.TextAntialiasing)
         
         # Viewport behavior
-        # 使用 NoViewportUpdate + 手动 viewport().update() 避免不必要的全屏重绘
-        # Use NoViewportUpdate + manual viewport().update() to avoid unnecessary full redraws
-        # 注：OpenGL 视口不支持局部更新，所以用 NoViewportUpdate 配合手动控制时机
-        self.setViewportUpdateMode(QGraphicsView.NoViewportUpdate)
+        # SmartViewportUpdate：Qt 只重绘图形项的脏区域（QOpenGLWidget 已设为 PartialUpdate 以保留帧缓冲）；
+        # 背景动画、辅助线等非图形项变化仍通过 scheduleViewportUpdate() 手动触发全屏重绘
+        # SmartViewportUpdate: Qt repaints only dirty item regions (the QOpenGLWidget uses PartialUpdate to keep
+        # its framebuffer); non-item changes such as board animation and guides still go through scheduleViewportUpdate()
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        # 每个图形项的 paint() 都会自行设置画笔/画刷/渲染提示，无需 Qt 在每项前后 save()/restore() 画家状态
+        # Every item's paint() sets its own pen/brush/render hints, so Qt need not save()/restore() the painter around each item
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
         self._viewport_update_timer = QTimer()
         self._viewport_update_timer.setSingleShot(True)
         self._viewport_update_timer.setInterval(16)  # ~60fps
@@ -950,6 +1416,66 @@ class RefView(QGraphicsView):
         
         # 组管理 / Group management
         self._groups = {}  # group_id -> GroupItem
+        
+        # 视图缩放共享引用：RefItem 直接读取，避免悬停时反复查询 transform
+        # Shared view-scale reference: RefItem reads it directly instead of querying transform on hover
+        self._view_scale_ref = [self.transform().m11()]
+        
+        # LOD 清理：滚动/缩放停止后检查离屏图片，连续多次不可见则释放其 pixmap
+        # LOD sweep: after scrolling/zooming settles, items off-screen for several sweeps drop their pixmaps
+        self._lod_evict_ticks = 3
+        self._lod_sweep_timer = QTimer()
+        self._lod_sweep_timer.setSingleShot(True)
+        self._lod_sweep_timer.setInterval(250)
+        self._lod_sweep_timer.timeout.connect(self._sweepOffscreenPixmaps)
+        self.horizontalScrollBar().valueChanged.connect(self._scheduleLodSweep)
+        self.verticalScrollBar().valueChanged.connect(self._scheduleLodSweep)
+        
+        # 点阵网格平铺贴图缓存 / Dot grid tile cache
+        self._grid_tile = None
+        self._grid_tile_key = None
+        
+        # 场景中的图片（有序集合，由 RefItem 加入/移出场景时维护）/ Images in the scene (ordered set, maintained by RefItem on scene changes)
+        self._ref_items = {}
+        # 批量插入期间暂停索引切换 / Index switching is paused during bulk inserts
+        self._bulk_insert = False
+        # 大选区拖拽/缩放期间是否暂停了索引 / Whether the index is suspended for a large drag/resize
+        self._transform_unindexed = False
+        
+        # 后台完整解码：按显示缓存键合并等待同一结果的图片 / Background full decodes: items waiting on the same result are merged by display cache key
+        self._pending_decodes = {}
+        self._decode_signals = ImageDecodeSignals(self)
+        self._decode_signals.imageDecoded.connect(self._onImageDecoded, Qt.QueuedConnection)
+        self._decode_signals.imagePreviewed.connect(self._onImagePreviewed, Qt.QueuedConnection)
+        # 已在 QPixmapCache 中的结果：在下一轮事件循环中批量换入（不在绘制流程中改动 pixmap）
+        # Results already in QPixmapCache: swapped in as one batch on the next event-loop turn (never mid-paint)
+        self._ready_swaps = []
+        # 后台生成的 mip 级别：按缓存键合并等待同一结果的图片 / Background mip levels: items waiting on the same result are merged by cache key
+        self._pending_mips = {}
+        self._decode_signals.imageScaled.connect(self._onImageScaled, Qt.QueuedConnection)
+
+    def _createViewport(self, acrylic):
+        """
+        创建 OpenGL 视口 / Create the OpenGL viewport
+        视口保持为 QOpenGLWidget：QGraphicsView 需要一个可用 QPainter 绘制的视口控件，而 createWindowContainer
+        包装的原生 QOpenGLWindow 既不能作为绘制目标，也不支持亚克力模式所需的透明穿透。
+        非亚克力模式下 drawBackground 会填满整个视口，因此标记为不透明，Qt 合成时不再先绘制视口下方的父控件。
+        The viewport stays a QOpenGLWidget: QGraphicsView needs a viewport widget it can paint with QPainter,
+        and a native QOpenGLWindow wrapped by createWindowContainer is neither a paint target nor able to
+        show through as acrylic mode requires. Outside acrylic mode drawBackground fills the whole viewport,
+        so it is marked opaque and Qt no longer paints the parent beneath it before compositing.
+        """
+        gl_widget = QOpenGLWidget()
+        if acrylic:
+            # 亚克力模式：在 QOpenGLWidget 上启用透明穿透
+            # Acrylic mode: enable transparent passthrough on QOpenGLWidget
+            gl_widget.setAttribute(Qt.WA_TranslucentBackground, True)
+        else:
+            gl_widget.setAttribute(Qt.WA_OpaquePaintEvent, True)
+            gl_widget.setAttribute(Qt.WA_NoSystemBackground, True)
+        # 保留帧缓冲内容，使局部更新只重绘脏区域 / Preserve framebuffer contents so partial updates only repaint dirty regions
+        gl_widget.setUpdateBehavior(QOpenGLWidget.PartialUpdate)
+        return gl_widget
 
     def set_acrylic_mode(self, enabled):
         """
@@ -957,23 +1483,18 @@ class RefView(QGraphicsView):
         始终使用 QOpenGLWidget（GPU 加速），亚克力模式通过 WA_TranslucentBackground 实现透明穿透。
         Always use QOpenGLWidget (GPU acceleration), acrylic mode uses WA_TranslucentBackground for passthrough.
         """
-        # 始终使用 QOpenGLWidget / Always use QOpenGLWidget
-        gl_widget = QOpenGLWidget()
         if enabled:
-            # 亚克力模式：在 QOpenGLWidget 上启用透明穿透
-            # Acrylic mode: enable transparent passthrough on QOpenGLWidget
             self.setAttribute(Qt.WA_TranslucentBackground, True)
-            gl_widget.setAttribute(Qt.WA_TranslucentBackground, True)
             self.setStyleSheet("background: transparent; border: 0px;")
         else:
             # 非亚克力模式：关闭透明
             # Non-acrylic mode: disable transparency
             self.setAttribute(Qt.WA_TranslucentBackground, False)
             self.setStyleSheet("")
-        self.setViewport(gl_widget)
+        self.setViewport(self._createViewport(enabled))
         
         # 重新设置视口更新模式和渲染提示 / Re-apply viewport update mode and render hints
-        self.setViewportUpdateMode(QGraphicsView.NoViewportUpdate)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
         self.setRenderHint(QPainter.Antialiasing)
         self.setRenderHint(QPainter.SmoothPixmapTransform)
         self.setRenderHint(QPainter.TextAntialiasing)
@@ -1014,11 +1535,9 @@ class RefView(QGraphicsView):
                 return
 
         if mime_data.hasUrls():
-            offset = 0
-            for url in mime_data.urls():
-                if url.isLocalFile():
-                    self.parent().load_image_file(url.toLocalFile(), pos.x() + offset, pos.y() + offset)
-                    offset += 20
+            # 后台线程解码，拖入多张大图时界面不卡顿 / Decode on a worker so dropping large images never freezes the UI
+            paths = [url.toLocalFile() for url in mime_data.urls() if url.isLocalFile()]
+            self.parent().load_image_files_async(paths, pos.x(), pos.y())
             self.markBoardBoundsDirty()
             self.scheduleViewportUpdate()
             event.acceptProposedAction()
@@ -1037,9 +1556,7 @@ class RefView(QGraphicsView):
         y_guides = []  # [(value, item_id)]
         self._snap_item_rects = {}  # {item_id: QRectF} 缓存参考物体边界
         
-        for item in self.scene().items():
-            if not isinstance(item, RefItem):
-                continue
+        for item in self._ref_items:
             if id(item) in dragged_ids:
                 continue
             
@@ -1343,6 +1860,233 @@ class RefView(QGraphicsView):
         if not self._viewport_update_timer.isActive():
             self._viewport_update_timer.start()
     
+    def decodeMaxSide(self):
+        """
+        图片解码的最长边上限：视口物理像素的 2 倍，限制在 [DECODE_MIN_SIDE, DECODE_MAX_SIDE] 之间
+        Longest-side cap for image decodes: twice the viewport in device pixels,
+        clamped to [DECODE_MIN_SIDE, DECODE_MAX_SIDE]
+        """
+        viewport = self.viewport()
+        side = max(viewport.width(), viewport.height()) * viewport.devicePixelRatioF()
+        return int(min(DECODE_MAX_SIDE, max(DECODE_MIN_SIDE, side * 2)))
+
+    def refItems(self):
+        """
+        场景中的全部图片（无需遍历所有图形项再按类型筛选）/ All images in the scene (no scan over every graphics item filtered by type)
+        """
+        return list(self._ref_items)
+
+    def _refItemSceneChanged(self, item, added):
+        """
+        图片加入/移出场景时维护图片集合 / Keep the image set up to date as images enter/leave the scene
+        """
+        if added:
+            self._ref_items[item] = None
+        else:
+            self._ref_items.pop(item, None)
+        self._updateIndexMethod()
+
+    def _updateIndexMethod(self):
+        """
+        图片数量变化时选择场景索引：少量图片不建索引（拖拽/缩放时无需维护 BSP 树），
+        大看板切回 BSP 索引以加速区域查询
+        Pick the scene index as the image count changes: small boards use no index (moves and
+        resizes skip BSP maintenance), large boards switch back to the BSP index for fast region queries
+        """
+        scene = self.scene()
+        if scene is None or self._bulk_insert:
+            return
+        count = len(self._ref_items)
+        method = scene.itemIndexMethod()
+        if method == QGraphicsScene.NoIndex and count > self.BSP_INDEX_THRESHOLD:
+            scene.setBspTreeDepth(self._bspTreeDepth(scene, count))
+            scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        elif method == QGraphicsScene.BspTreeIndex and count < self.NO_INDEX_THRESHOLD:
+            scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+
+    def _bspTreeDepth(self, scene, count):
+        """
+        BSP 树深度：Qt 默认按图片数取 log2，并把叶子均匀铺满整个（近乎无限的）场景矩形，
+        图片集中在其中一小块时绝大多数叶子为空；按场景面积与图片实际占用面积之比加深，
+        使图片所在区域仍分到约 count 个叶子
+        BSP tree depth: Qt defaults to log2 of the item count and spreads the leaves evenly over the whole
+        (near-infinite) scene rect, so most leaves are empty when the images cluster in a small part of it;
+        deepen by the ratio of scene area to occupied area so the occupied region still gets about count leaves
+        """
+        depth = max(5, math.ceil(math.log2(count)))
+        used = scene.itemsBoundingRect()
+        scene_rect = scene.sceneRect()
+        used_area = used.width() * used.height()
+        if used_area > 0:
+            ratio = scene_rect.width() * scene_rect.height() / used_area
+            if ratio > 1:
+                depth += math.ceil(math.log2(ratio))
+        return min(depth, self.BSP_MAX_DEPTH)
+
+    def setBulkInsert(self, enabled):
+        """
+        批量增删图片（如加载看板）期间关闭场景索引，结束后按最终数量一次性选择索引方式
+        Drop the scene index while bulk adding/removing images (e.g. loading a board), then pick
+        the index method once from the final count
+        """
+        if enabled == self._bulk_insert:
+            return
+        self._bulk_insert = enabled
+        scene = self.scene()
+        if enabled:
+            if scene is not None:
+                scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        else:
+            self._updateIndexMethod()
+
+    def requestDecode(self, item, source, key, max_side, preview=False):
+        """
+        在后台线程解码图片项的完整显示 pixmap，完成后替换其预览；相同图片只解码一次；
+        已缓存时不再解码，在下一轮事件循环中直接换入
+        Decode an item's full display pixmap on a background thread and replace its preview when done;
+        identical images are decoded only once, and a cached result is swapped in on the next event-loop turn
+        preview: 图片项尚无可显示内容，后台先发出低分辨率预览 / The item shows nothing yet, so the worker emits a low-res preview first
+        """
+        cdm = getattr(QApplication.instance(), 'color_depth_manager', None)
+        cache_key = display_cache_key(key, max_side, cdm)
+        pixmap = QPixmap()
+        if QPixmapCache.find(cache_key, pixmap):
+            if not self._ready_swaps:
+                QTimer.singleShot(0, self._flushReadySwaps)
+            self._ready_swaps.append((item, pixmap))
+            return
+        pending = self._pending_decodes.get(cache_key)
+        if pending is not None:
+            pending[1].append(item)
+            return
+        self._pending_decodes[cache_key] = (key, [item])
+        QThreadPool.globalInstance().start(
+            ImageDecodeTask(source, cache_key, self._decode_signals, cdm, max_side, preview))
+
+    def _flushReadySwaps(self):
+        """
+        换入已命中缓存的 pixmap / Swap in the pixmaps that were found in the cache
+        """
+        swaps, self._ready_swaps = self._ready_swaps, []
+        for item, pixmap in swaps:
+            item._swap_in_pixmap(pixmap)
+
+    def _onImagePreviewed(self, cache_key, image):
+        """
+        后台预览解码完成：换入仍在等待完整版本的图片 / Background preview decoded: swap it into the items still waiting for the full version
+        """
+        pending = self._pending_decodes.get(cache_key)
+        if pending is None:
+            return
+        pixmap = QPixmap.fromImage(image)
+        if pixmap.isNull():
+            return
+        for item in pending[1]:
+            item._swap_in_pixmap(pixmap, preview=True)
+
+    def _onImageDecoded(self, cache_key, image, source_size):
+        """
+        后台解码完成：转换为 QPixmap（只能在主线程），存入缓存并换入所有等待的图片
+        Background decode finished: convert to QPixmap (main thread only), cache it and swap it into every waiting item
+        """
+        key, items = self._pending_decodes.pop(cache_key, (None, ()))
+        pixmap = QPixmap.fromImage(image)
+        if pixmap.isNull():
+            # 解码失败：等待的图片各自同步重试一次，仍失败则显示错误占位，不会再次排队
+            # Decode failed: each waiting item retries once synchronously and shows the error placeholder
+            # if that fails too, so it is never queued again
+            for item in items:
+                item._fallback_decode()
+            return
+        # 登记原图尺寸，之后 load_item_pixmap 可直接命中缓存 / Record the source size so load_item_pixmap hits the cache from now on
+        if key is not None:
+            _source_sizes[key] = source_size
+        QPixmapCache.insert(cache_key, pixmap)
+        for item in items:
+            item._swap_in_pixmap(pixmap)
+
+    def mipPixmap(self, item, pixmap, level):
+        """
+        返回 pixmap 第 level 级的缩小版本：经 QPixmapCache 按 pixmap 共享（重复图片只生成一次）；
+        尚未生成时交给后台线程，完成后重绘等待的图片，在此之前直接返回原 pixmap
+        Return the level-th reduction of a pixmap, shared per pixmap through QPixmapCache (duplicate
+        images build it once); when missing it is built on a background thread and the waiting items
+        repaint once it lands, with the original pixmap returned until then
+        """
+        cache_key = "mip:%d:%d" % (pixmap.cacheKey(), level)
+        mip = QPixmap()
+        if QPixmapCache.find(cache_key, mip):
+            return mip
+        pending = self._pending_mips.get(cache_key)
+        if pending is not None:
+            if item not in pending:
+                pending.append(item)
+            return pixmap
+        self._pending_mips[cache_key] = [item]
+        # toImage() 与 pixmap 共享像素数据（光栅 pixmap），工作线程只读取 / toImage() shares pixels with a raster pixmap; the worker only reads them
+        QThreadPool.globalInstance().start(ImageScaleTask(pixmap.toImage(), cache_key, level, self._decode_signals))
+        return pixmap
+
+    def _onImageScaled(self, cache_key, image):
+        """
+        mip 级别生成完成：存入缓存并重绘等待的图片 / Mip level built: cache it and repaint the waiting items
+        """
+        items = self._pending_mips.pop(cache_key, ())
+        pixmap = QPixmap.fromImage(image)
+        if pixmap.isNull():
+            return
+        QPixmapCache.insert(cache_key, pixmap)
+        for item in items:
+            if item.scene() is not None:
+                item.update()
+
+    def beginItemTransform(self, count):
+        """
+        开始拖拽/缩放 count 张图片：BSP 索引下每帧每张图片的 setPos/setScale 都要更新索引树，
+        选区很大时改为暂停索引，结束时一次性重建
+        Start dragging/resizing count images: under the BSP index every per-frame setPos/setScale of
+        every image updates the tree, so large selections suspend the index and rebuild it once at the end
+        """
+        scene = self.scene()
+        if (count >= self.TRANSFORM_UNINDEX_MIN and not self._bulk_insert and scene is not None
+                and scene.itemIndexMethod() == QGraphicsScene.BspTreeIndex):
+            self._transform_unindexed = True
+            self.setBulkInsert(True)
+
+    def endItemTransform(self):
+        """
+        结束拖拽/缩放，恢复暂停的索引 / Finish a drag/resize, restoring a suspended index
+        """
+        if self._transform_unindexed:
+            self._transform_unindexed = False
+            self.setBulkInsert(False)
+
+    def _scheduleLodSweep(self, *args):
+        """
+        调度一次离屏 pixmap 清理（去抖）/ Schedule an off-screen pixmap sweep (debounced)
+        """
+        self._lod_sweep_timer.start()
+
+    def _sweepOffscreenPixmaps(self):
+        """
+        标记可见图片，连续 _lod_evict_ticks 次不可见的图片释放其已解码 pixmap
+        Mark visible images; those off-screen for _lod_evict_ticks sweeps release their decoded pixmap
+        """
+        # 可见区域四周各留半个视口的余量，避免刚移出边缘就被释放
+        # Keep half a viewport of slack on each side so items just past the edge stay decoded
+        visible_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        visible_rect.adjust(-visible_rect.width() / 2, -visible_rect.height() / 2,
+                            visible_rect.width() / 2, visible_rect.height() / 2)
+        visible = set(self.scene().items(visible_rect))
+        
+        for item in self._ref_items:
+            if item in visible:
+                item._offscreen_ticks = 0
+            else:
+                item._offscreen_ticks += 1
+                if item._offscreen_ticks >= self._lod_evict_ticks:
+                    item.evict_pixmap()
+
     def markBoardBoundsDirty(self):
         """
         标记画板边界需要重新计算 / Mark board bounds as needing recalculation
@@ -1415,7 +2159,7 @@ class RefView(QGraphicsView):
         更新画板边界，只扩展不收缩 / Update board bounds, expand only never shrink
         当图片移出画板边界时，扩展画板以包含该图片
         """
-        items = [item for item in self.scene().items() if isinstance(item, RefItem)]
+        items = self.refItems()
         
         if not items:
             return  # 没有图片时保持当前画板大小
@@ -1509,7 +2253,7 @@ class RefView(QGraphicsView):
         根据实际图片分布重置画板大小 / Reset board size based on actual image distribution
         如果没有图片，则重置为默认大小
         """
-        items = [item for item in self.scene().items() if isinstance(item, RefItem)]
+        items = self.refItems()
         
         if not items:
             # 没有图片时重置为默认大小
@@ -1598,10 +2342,18 @@ class RefView(QGraphicsView):
         large_grid_color.setAlpha(int(Config.ue5_large_line_alpha * alpha_factor))
 
         # --- 绘制小网格线 ---
-        left = int(rect.left()) - (int(rect.left()) % effective_small)
+        # grid_size 为 2 的幂时，各级网格间距（grid_size × 2^k）也是 2 的幂，取整可用位与代替取模
+        # With a power-of-two grid_size every LOD spacing (grid_size × 2^k) is one too,
+        # so snapping uses a bit-and instead of a modulo
+        if Config._grid_mask is not None:
+            align = ~(effective_small - 1)
+            left = int(rect.left()) & align
+            top_val = int(rect.top()) & align
+        else:
+            left = int(rect.left()) - (int(rect.left()) % effective_small)
+            top_val = int(rect.top()) - (int(rect.top()) % effective_small)
         if left < rect.left():
             left += effective_small
-        top_val = int(rect.top()) - (int(rect.top()) % effective_small)
         if top_val < rect.top():
             top_val += effective_small
         right = int(rect.right())
@@ -1628,10 +2380,15 @@ class RefView(QGraphicsView):
                 y += effective_small
 
         # --- 绘制大网格线 ---
-        left_l = int(rect.left()) - (int(rect.left()) % effective_large)
+        if (effective_large & (effective_large - 1)) == 0:
+            align = ~(effective_large - 1)
+            left_l = int(rect.left()) & align
+            top_l = int(rect.top()) & align
+        else:
+            left_l = int(rect.left()) - (int(rect.left()) % effective_large)
+            top_l = int(rect.top()) - (int(rect.top()) % effective_large)
         if left_l < rect.left():
             left_l += effective_large
-        top_l = int(rect.top()) - (int(rect.top()) % effective_large)
         if top_l < rect.top():
             top_l += effective_large
 
@@ -1652,62 +2409,72 @@ class RefView(QGraphicsView):
 
     def _drawGridInRect(self, painter, rect):
         """
-        在指定区域内绘制网格点（LOD 翻倍策略 + 无逐点检查）
-        Draw grid dots within specified rect (LOD doubling strategy + no per-point check)
-        借鉴 macOS 版本的 LOD 机制：当屏幕上的点间距 < 15px 时翻倍间距
+        在指定区域内绘制网格点（LOD 翻倍策略 + 预渲染平铺贴图）
+        Draw grid dots within specified rect (LOD doubling strategy + pre-rendered tile)
+        借鉴 macOS 版本的 LOD 机制：当屏幕上的点间距 < 15px 时翻倍间距；
+        点阵预先渲染到一块平铺贴图中，每帧只需一次 drawTiledPixmap
         """
         # 获取当前缩放级别 / Get current zoom level
         view_scale = self.transform().m11()
         if view_scale < 0.001:
             view_scale = 0.001
         
+        # 点已小于半个像素时不再绘制 / Skip entirely once dots would be sub-pixel
+        if Config.dot_size * view_scale < 0.5:
+            return
+        
         # LOD 翻倍策略（借鉴 macOS）：保证屏幕上的点间距 >= 15px
         # LOD doubling (from macOS): ensure screen dot spacing >= 15px
-        effective_spacing = Config.grid_size
-        while (effective_spacing * view_scale) < 15:
-            effective_spacing *= 2
-        grid_size = effective_spacing
-        
-        # 精确计算网格对齐的起止范围（避免逐点 rect.contains 检查）
-        # Precisely compute grid-aligned start/end (avoid per-point rect.contains)
-        left = int(rect.left()) - (int(rect.left()) % grid_size)
-        if left < rect.left():
-            left += grid_size
-        top = int(rect.top()) - (int(rect.top()) % grid_size)
-        if top < rect.top():
-            top += grid_size
-        right = int(rect.right())
-        bottom = int(rect.bottom())
-        
-        # 安全上限：如果点数仍然过多则进一步翻倍间距
-        # Safety cap: further double spacing if too many points
-        cols = max(1, (right - left) // grid_size + 1)
-        rows = max(1, (bottom - top) // grid_size + 1)
-        while cols * rows > 5000:
+        grid_size = Config.grid_size
+        while (grid_size * view_scale) < 15:
             grid_size *= 2
-            left = int(rect.left()) - (int(rect.left()) % grid_size)
-            if left < rect.left():
-                left += grid_size
-            top = int(rect.top()) - (int(rect.top()) % grid_size)
-            if top < rect.top():
-                top += grid_size
-            cols = max(1, (right - left) // grid_size + 1)
-            rows = max(1, (bottom - top) // grid_size + 1)
-        
-        # 直接生成所有点（无需逐点检查 rect.contains）
-        # Generate all points directly (no per-point rect.contains needed)
-        points = []
-        x = left
-        while x <= right:
-            y = top
-            while y <= bottom:
-                points.append(QPointF(x, y))
-                y += grid_size
-            x += grid_size
         
-        if points:
-            painter.setPen(QPen(Config.grid_color, Config.dot_size))
-            painter.drawPoints(points)
+        tile, tile_scene = self._gridTile(grid_size, view_scale)
+        
+        # 贴图中的点位于单元格中心（避免在贴图边缘被裁切），因此平铺原点偏移半个单元格，
+        # 使点正好落在 grid_size 的整数倍上
+        # Dots sit at cell centres inside the tile (so they are not clipped at tile edges),
+        # so the tiling origin is shifted by half a cell to land dots on multiples of grid_size
+        half = grid_size / 2
+        unit = tile_scene / tile.width()  # 每个贴图像素对应的场景单位 / Scene units per tile pixel
+        
+        painter.save()
+        painter.scale(unit, unit)
+        target = QRectF(rect.left() / unit, rect.top() / unit, rect.width() / unit, rect.height() / unit)
+        offset = QPointF(((rect.left() + half) % tile_scene) / unit, ((rect.top() + half) % tile_scene) / unit)
+        painter.drawTiledPixmap(target, tile, offset)
+        painter.restore()
+
+    def _gridTile(self, grid_size, view_scale):
+        """
+        获取点阵平铺贴图（按间距/缩放/颜色缓存，参数变化时才重新渲染）
+        Get the dot grid tile (cached by spacing/zoom/color, re-rendered only when they change)
+        贴图按设备像素分辨率渲染，缩放后依然清晰 / Rendered at device resolution so it stays crisp at any zoom
+        返回 / Returns: (QPixmap, 贴图边长的场景单位 / tile side in scene units)
+        """
+        # 最多 16×16 个单元格，且贴图边长不超过约 1024 设备像素
+        # At most 16×16 cells, keeping the tile side around 1024 device pixels or less
+        cells = max(1, min(16, int(1024 // (grid_size * view_scale))))
+        tile_scene = cells * grid_size
+        tile_px = max(1, int(round(tile_scene * view_scale)))
+        
+        tile_key = (grid_size, cells, tile_px, Config.grid_color.rgba(), Config.dot_size)
+        if self._grid_tile_key != tile_key:
+            tile = QPixmap(tile_px, tile_px)
+            tile.fill(Qt.transparent)
+            
+            tile_painter = QPainter(tile)
+            tile_painter.setRenderHint(QPainter.Antialiasing)
+            tile_painter.scale(tile_px / tile_scene, tile_px / tile_scene)
+            tile_painter.setPen(QPen(Config.grid_color, Config.dot_size))
+            half = grid_size / 2
+            tile_painter.drawPoints(QPolygonF([QPointF(c * grid_size + half, r * grid_size + half)
+                                                for c in range(cells) for r in range(cells)]))
+            tile_painter.end()
+            
+            self._grid_tile = tile
+            self._grid_tile_key = tile_key
+        return self._grid_tile, tile_scene
 
     def wheelEvent(self, event):
         """
@@ -1716,6 +2483,13 @@ class RefView(QGraphicsView):
         # Wheel -> Zoom Canvas
         zoom_factor = 1.1 if event.angleDelta().y() > 0 else 0.9
         self.scale(zoom_factor, zoom_factor)
+        self._view_scale_ref[0] = self.transform().m11()
+        # 手柄保持恒定屏幕大小，缩放后需刷新选中项的边界外扩
+        # Handles keep a constant screen size, so selected items refresh their padding after zoom
+        for item in self.scene().selectedItems():
+            if isinstance(item, RefItem):
+                item._updateHandleMargin()
+        self._scheduleLodSweep()
         self.scheduleViewportUpdate()
 
     def mouseDoubleClickEvent(self, event):
@@ -1796,16 +2570,10 @@ class RefView(QGraphicsView):
             return
             
         super().mouseMoveEvent(event)
-        # 注：super().mouseMoveEvent() 内部已通过 ItemSendsGeometryChanges 触发场景更新，
-        # Smart Guides 的 _performSnap 也会调用 scheduleViewportUpdate()，
-        # 此处不再无条件调用，避免双重重绘。
-        # Note: super().mouseMoveEvent() already triggers scene updates via ItemSendsGeometryChanges,
-        # and Smart Guides' _performSnap also calls scheduleViewportUpdate(),
-        # so we no longer unconditionally call it here to avoid double redraws.
-        # 但在 NoViewportUpdate 模式下，仍需确保至少有一次调度
-        # However, in NoViewportUpdate mode, we still need to ensure at least one scheduled update
-        if not self._viewport_update_timer.isActive():
-            self.scheduleViewportUpdate()
+        # 注：SmartViewportUpdate 模式下，拖动图形项与橡皮筋选框由 Qt 自动重绘脏区域；
+        # Smart Guides 的 _performSnap 会自行调用 scheduleViewportUpdate() 以刷新辅助线。
+        # Note: in SmartViewportUpdate mode Qt repaints dirty regions for item drags and the rubber band itself;
+        # Smart Guides' _performSnap calls scheduleViewportUpdate() on its own to refresh guide lines.
 
     def mouseReleaseEvent(self, event):
         """
@@ -1,21 +1,22 @@
 import sys
 import os
-import json
-import base64
 import math
+import time
 import ctypes
 
-from PySide6.QtCore import Qt, QByteArray, QBuffer, QRectF, QPointF, QTimer, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup
+from PySide6.QtCore import Qt, QByteArray, QBuffer, QRectF, QPointF, QTimer, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, QThreadPool, QSize
 from PySide6.QtWidgets import (QMainWindow, QGraphicsScene, QFileDialog, QMenu, QMessageBox, QApplication,
                                 QToolButton, QWidget, QHBoxLayout, QSizePolicy, QDialog, QVBoxLayout, QLabel,
-                                QGraphicsDropShadowEffect)
+                                QGraphicsDropShadowEffect, QProgressDialog)
 from PySide6.QtGui import QPixmap, QAction, QShortcut, QKeySequence, QImage, QPainter, QColor, QFont
-from Config import Config, tr
-from Views.Canvas import RefItem, RefView, GroupItem, GroupSettingsDialog
+from Config import Config, tr, tr_batch
+from Views.Canvas import RefItem, RefView, GroupItem, GroupSettingsDialog, load_item_pixmap, remember_display_pixmap
 from Views.SettingsDialog import SettingsDialog
-from ViewModels.MainViewModel import MainViewModel
+from ViewModels.MainViewModel import MainViewModel, BOARD_ARCHIVE_EXT
 from Models.UndoManager import UndoManager, MoveCommand, ScaleCommand, AddItemCommand, DeleteItemsCommand, ClearBoardCommand, OrganizeItemsCommand, GroupCommand, UngroupCommand, GroupMoveCommand
 from Models.ColorDepthManager import ColorDepthManager, ColorDepthMode
+from Models.ImageLoader import ImageLoadSignals, ImageLoadTask, read_image_size
+from Models.BoardIO import BoardIOSignals, BoardSaveTask
 
 
 class AboutDialog(QDialog):
@@ -181,6 +182,10 @@ class MainWindow(QMainWindow):
     """
     主窗口类 / Main window class
     """
+    # 增量加载每个事件循环周期的时间预算（秒）：约半帧，留出时间给重绘和输入
+    # Per-tick time budget for incremental loading (seconds): about half a frame, leaving room for repaints and input
+    BOARD_LOAD_STEP_BUDGET = 0.008
+
     def __init__(self):
         """
         初始化主窗口，设置场景、视图、菜单和快捷键 / Initialize main window, set scene, view, menu and shortcuts
@@ -196,6 +201,10 @@ class MainWindow(QMainWindow):
         
         self.scene = QGraphicsScene()
         self.scene.setSceneRect(-50000, -50000, 100000, 100000) # Infinite-ish canvas
+        # 交互频繁、图片不多时不建索引：移动/缩放不再触发 BSP 重建；图片超过阈值后由 RefView 切回 BSP
+        # No index for interactive boards of modest size: moves/resizes skip BSP updates;
+        # RefView switches back to BSP once the image count passes its threshold
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         
         self.view = RefView(self.scene, self)
         self.setCentralWidget(self.view)
@@ -219,6 +228,32 @@ class MainWindow(QMainWindow):
         # 应用内剪贴板：直接索引，零编解码 / In-app clipboard: direct reference, zero encoding
         self._copied_items = []
         
+        # 导入解码专用线程池：按核心数的一半限制并发，避免解码任务抢占 GUI 线程；
+        # 全局线程池保持默认大小，留给画布上可见图片的解码与 mip 生成，大批量导入不会挤占它们
+        # Dedicated import decode pool: capped at half the cores so decoding never starves the GUI thread;
+        # the global pool keeps its default size for on-screen decodes and mip levels, so a large import cannot crowd them out
+        self._image_pool = QThreadPool(self)
+        self._image_pool.setMaxThreadCount(max(1, (os.cpu_count() or 2) // 2))
+        # 看板保存专用线程（一次只进行一个保存）/ Dedicated board save thread (only one save runs at a time)
+        self._board_pool = QThreadPool(self)
+        self._board_pool.setMaxThreadCount(1)
+        self._image_load_signals = ImageLoadSignals(self)
+        # 显式排队连接：结果总是在 GUI 线程的事件循环中插入场景 / Explicitly queued: results are always inserted on the GUI thread's event loop
+        self._image_load_signals.imageLoaded.connect(self._on_image_file_loaded, Qt.QueuedConnection)
+        
+        # 后台保存看板的状态 / Background board save state
+        self._board_io_signals = BoardIOSignals(self)
+        self._board_io_signals.saveFinished.connect(self._on_board_saved)
+        self._board_saving = False
+        self._save_progress = None
+        # 本次保存中由保存任务编码的图片（与 saveFinished 的编码结果一一对应）/ Items the running save task encodes (matches saveFinished's encoded bytes)
+        self._save_encode_items = []
+        
+        # 增量加载看板的状态 / Incremental board load state
+        self._board_load_records = None
+        self._board_load_pending = None
+        self._board_load_groups = []
+        
         # G键打组快捷键 / G key grouping shortcut
         self.group_shortcut = QShortcut(QKeySequence("G"), self)
         self.group_shortcut.activated.connect(self.group_selected_items)
@@ -242,59 +277,38 @@ class MainWindow(QMainWindow):
         self.menuBar().hide()
 
         # --- 构建菜单数据（QMenu 对象）/ Build menu data (QMenu objects) ---
-        self._file_menu = QMenu(tr("file"), self)
-        act_add = QAction(tr("open_image"), self)
-        act_add.triggered.connect(self.add_images)
-        self._file_menu.addAction(act_add)
+        # 所有可翻译文本登记为 (setter, 翻译键)，切换语言时由 retranslate_ui 原地更新
+        # Every translatable text is registered as (setter, key) so retranslate_ui can update it in place on language change
+        self._ui_texts = []
+        self._file_menu = self._make_menu("file")
+        self._add_menu_action(self._file_menu, "open_image", self.add_images)
         self._file_menu.addSeparator()
-        act_save = QAction(tr("save_board"), self)
-        act_save.triggered.connect(self.save_board)
-        self._file_menu.addAction(act_save)
-        act_load = QAction(tr("load_board"), self)
-        act_load.triggered.connect(self.load_board)
-        self._file_menu.addAction(act_load)
+        self._add_menu_action(self._file_menu, "save_board", self.save_board)
+        self._add_menu_action(self._file_menu, "load_board", self.load_board)
         self._file_menu.addSeparator()
-        act_export = QAction(tr("export_image"), self)
-        act_export.triggered.connect(self.export_board_to_image)
-        self._file_menu.addAction(act_export)
-        act_export_clipboard = QAction(tr("export_to_clipboard"), self)
-        act_export_clipboard.triggered.connect(self.export_board_to_clipboard)
-        self._file_menu.addAction(act_export_clipboard)
+        self._add_menu_action(self._file_menu, "export_image", self.export_board_to_image)
+        self._add_menu_action(self._file_menu, "export_to_clipboard", self.export_board_to_clipboard)
         self._file_menu.addSeparator()
-        act_clear = QAction(tr("clear_board"), self)
-        act_clear.triggered.connect(self.clear_board)
-        self._file_menu.addAction(act_clear)
+        self._add_menu_action(self._file_menu, "clear_board", self.clear_board)
         self._file_menu.addSeparator()
-        act_exit = QAction(tr("exit"), self)
-        act_exit.triggered.connect(self.close)
-        self._file_menu.addAction(act_exit)
-
-        self._settings_menu = QMenu(tr("settings"), self)
-        act_prefs = QAction(tr("preferences"), self)
-        act_prefs.triggered.connect(self.show_settings)
-        self._settings_menu.addAction(act_prefs)
+        self._add_menu_action(self._file_menu, "exit", self.close)
+
+        self._settings_menu = self._make_menu("settings")
+        self._add_menu_action(self._settings_menu, "preferences", self.show_settings)
         self._settings_menu.addSeparator()
-        self.act_top = QAction(tr("always_on_top"), self)
+        self.act_top = self._add_menu_action(self._settings_menu, "always_on_top", self.toggle_always_on_top)
         self.act_top.setCheckable(True)
-        self.act_top.triggered.connect(self.toggle_always_on_top)
-        self._settings_menu.addAction(self.act_top)
 
-        self._edit_menu = QMenu(tr("edit"), self)
-        self.act_undo = QAction(tr("undo"), self)
+        self._edit_menu = self._make_menu("edit")
+        self.act_undo = self._add_menu_action(self._edit_menu, "undo", self.undo_action)
         self.act_undo.setShortcut(QKeySequence.Undo)
         self.act_undo.setShortcutContext(Qt.ShortcutContext.ApplicationShortcut)
-        self.act_undo.triggered.connect(self.undo_action)
-        self._edit_menu.addAction(self.act_undo)
-        self.act_redo = QAction(tr("redo"), self)
+        self.act_redo = self._add_menu_action(self._edit_menu, "redo", self.redo_action)
         self.act_redo.setShortcut(QKeySequence("Ctrl+Shift+Z"))
         self.act_redo.setShortcutContext(Qt.ShortcutContext.ApplicationShortcut)
-        self.act_redo.triggered.connect(self.redo_action)
-        self._edit_menu.addAction(self.act_redo)
 
-        self._help_menu = QMenu(tr("help"), self)
-        act_about = QAction(tr("about"), self)
-        act_about.triggered.connect(self.show_about)
-        self._help_menu.addAction(act_about)
+        self._help_menu = self._make_menu("help")
+        self._add_menu_action(self._help_menu, "about", self.show_about)
 
         # 确保快捷键即使菜单隐藏也能工作 / Ensure shortcuts work even when menu is hidden
         self.addAction(self.act_undo)
@@ -319,6 +333,7 @@ class MainWindow(QMainWindow):
         self._hamburger_btn = QToolButton(self._menu_float)
         self._hamburger_btn.setText("☰")
         self._hamburger_btn.setToolTip(tr("menu_tooltip"))
+        self._ui_texts.append((self._hamburger_btn.setToolTip, "menu_tooltip"))
         self._hamburger_btn.setObjectName("hamburgerBtn")
         self._hamburger_btn.setFixedSize(30, 30)
         self._hamburger_btn.setStyleSheet("""
@@ -349,15 +364,16 @@ class MainWindow(QMainWindow):
 
         # 创建各菜单的 QToolButton / Create QToolButton for each menu
         menu_items = [
-            (tr("file"), self._file_menu),
-            (tr("settings"), self._settings_menu),
-            (tr("edit"), self._edit_menu),
-            (tr("help"), self._help_menu),
+            ("file", self._file_menu),
+            ("settings", self._settings_menu),
+            ("edit", self._edit_menu),
+            ("help", self._help_menu),
         ]
         self._menu_buttons = []
-        for label, menu in menu_items:
+        for key, menu in menu_items:
             btn = QToolButton(self._menu_container)
-            btn.setText(label)
+            btn.setText(tr(key))
+            self._ui_texts.append((btn.setText, key))
             btn.setMenu(menu)
             btn.setPopupMode(QToolButton.InstantPopup)
             btn.setObjectName("menuBtn")
@@ -412,6 +428,39 @@ class MainWindow(QMainWindow):
         self.view.setContextMenuPolicy(Qt.CustomContextMenu)
         self.view.customContextMenuRequested.connect(self.show_context_menu)
 
+    def _make_menu(self, key):
+        """
+        创建可翻译标题的菜单 / Create a menu with a translatable title
+        """
+        menu = QMenu(tr(key), self)
+        self._ui_texts.append((menu.setTitle, key))
+        return menu
+
+    def _add_menu_action(self, menu, key, slot):
+        """
+        创建可翻译文本的菜单项并加入菜单 / Create a menu action with translatable text and add it to the menu
+        """
+        action = QAction(tr(key), self)
+        action.triggered.connect(slot)
+        menu.addAction(action)
+        self._ui_texts.append((action.setText, key))
+        return action
+
+    def retranslate_ui(self):
+        """
+        按当前语言原地更新菜单文本（不重建 QAction/QMenu）/ Update menu texts in place for the current language (no QAction/QMenu rebuild)
+        """
+        texts = tr_batch(key for _, key in self._ui_texts)
+        for setter, key in self._ui_texts:
+            setter(texts[key])
+        if self._menu_expanded:
+            # 展开状态下按新文本宽度重新布局按钮 / While expanded, re-lay the buttons out for the new text widths
+            widths = [btn.sizeHint().width() for btn in self._menu_buttons]
+            for btn, width in zip(self._menu_buttons, widths):
+                btn.setFixedWidth(width)
+            self._menu_container.setMaximumWidth(sum(widths) + 6 * (len(self._menu_buttons) - 1) + 10)
+            self._update_float_width()
+
     def _toggle_menu_expand(self):
         """切换菜单展开/收起 / Toggle menu expand/collapse"""
         if self._menu_expanded:
@@ -570,14 +619,9 @@ class MainWindow(QMainWindow):
         切换语言 / Change language
         """
         Config.language = lang
-        self.setWindowTitle("HajimiRef") # 更新主窗口标题 / Update main window title
-        # Rebuild menu is complex in Qt dynamic, simpler to just restart or update texts.
-        # For simplicity, we just update title and let user restart or re-open menus.
-        # A full reload would require clearing menuBar and calling setup_menu again.
-        # 移除旧浮动菜单并重建 / Remove old float menu and rebuild
-        if hasattr(self, '_menu_float'):
-            self._menu_float.deleteLater()
-        self.setup_menu()
+        # 主窗口标题固定为 "HajimiRef"，无需随语言更新 / The main window title is always "HajimiRef" and needs no update
+        # 原地更新文本，不重建菜单 / Update texts in place instead of rebuilding the menus
+        self.retranslate_ui()
 
     def toggle_always_on_top(self):
         """
@@ -1312,18 +1356,30 @@ class MainWindow(QMainWindow):
         files, _ = QFileDialog.getOpenFileNames(self, tr("open_image"), "", "Images (*.png *.jpg *.jpeg *.bmp *.gif *.webp)")
         if files:
             center = self.view.mapToScene(self.view.viewport().rect().center())
-            offset = 0
-            for f in files:
-                self.load_image_file(f, center.x() + offset, center.y() + offset)
-                offset += 20
+            # 多个文件并行解码，界面不卡顿 / Files decode in parallel on the pool, the UI stays responsive
+            self.load_image_files_async(files, center.x(), center.y())
+
+    # 批量导入时相邻图片的错开距离 / Offset between consecutive images of a batch import
+    IMPORT_CASCADE_STEP = 20
 
-    def load_image_file(self, path, x, y):
+    def load_image_files_async(self, paths, x, y):
         """
-        从文件路径加载图片 / Load image from file path
+        批量后台导入图片文件：在分发前算好每张图片的层叠位置（从 (x, y) 起依次右下错开），一次性提交给线程池
+        Import several image files in the background: each image's cascaded position (stepping down-right
+        from (x, y)) is computed before dispatch and all tasks are submitted in one go
         """
-        data = self.vm.read_image_file(path)
-        if data:
-            self.create_item_from_data(data, x, y)
+        step = self.IMPORT_CASCADE_STEP
+        for i, path in enumerate(paths):
+            self.load_image_file_async(path, x + i * step, y + i * step)
+
+    def load_image_file_async(self, path, x, y):
+        """
+        在后台线程读取并解码图片文件，完成后在主线程创建图片项
+        Read and decode an image file on a worker thread, then create the item on the main thread
+        """
+        task = ImageLoadTask(path, x, y, self._image_load_signals, self._get_color_depth_manager(),
+                             self.view.decodeMaxSide())
+        self._image_pool.start(task)
 
     def _get_color_depth_manager(self) -> ColorDepthManager:
         """
@@ -1335,19 +1391,35 @@ class MainWindow(QMainWindow):
         # 回退：创建默认实例 / Fallback: create default instance
         return ColorDepthManager(ColorDepthManager.get_mode_from_string(Config.color_depth_mode))
 
-    def create_item_from_image(self, image, x, y):
+    def _on_image_file_loaded(self, image, x, y, path, source_size, max_side):
+        """
+        后台解码完成：以源文件路径代替原始字节创建图片项（图像已在工作线程完成色深转换）
+        Background decode finished: create the item with its source path instead of raw bytes
+        (the image was already color-converted on the worker)
+        """
+        item = self.create_item_from_image(image, x, y, source_size=source_size, source_path=path, converted=True)
+        if item is not None:
+            # 复用这次转换结果：离屏释放后重新进入视野时无需再次解码 / Reuse this conversion: re-entering view after eviction needs no new decode
+            item._pixmap_key = remember_display_pixmap(path, item.full_pixmap(), source_size, max_side)
+
+    def create_item_from_image(self, image, x, y, data=None, source_size=None, source_path=None, converted=False):
         """
         从 QImage 创建图片项（自适应色深转换）/ Create image item from QImage (adaptive color depth)
+        data: 可选的原始文件字节，保存时直接使用 / Optional original file bytes, used as-is when saving
+        source_size: 原图尺寸（image 可能为缩小解码的结果）/ Original size (image may have been decoded scaled down)
+        source_path: 源文件路径，保存时从中读取原始字节 / Source file path, read for the raw bytes on save
+        converted: image 已是目标渲染格式，跳过色深检测与转换 / image is already in the render format, skip depth detection and conversion
         """
         if not image.isNull():
             # ── 自适应色深：根据图像原始位深选择最佳渲染格式 ──
             # Adaptive color depth: select optimal rendering format based on image's original bit depth
-            cdm = self._get_color_depth_manager()
-            image = cdm.convert_image(image)
-            # QImage → QPixmap
+            if not converted:
+                image = self._get_color_depth_manager().convert_image(image)
+            # QImage → QPixmap（一次上传，无中间编码）/ QImage → QPixmap (single upload, no intermediate encode)
             pixmap = QPixmap.fromImage(image)
             if not pixmap.isNull():
-                item = RefItem(pixmap)  # image_data 为 None，惰性生成 / image_data is None, lazy generation
+                # 无原始字节时 image_data 为 None，保存时惰性生成 / Without original bytes image_data is None, generated lazily on save
+                item = RefItem(pixmap, data, source_size, source_path=source_path)
                 item.setPos(x, y)
                 self.scene.addItem(item)
                 self.undo_manager.push(AddItemCommand(self.scene, item))
@@ -1356,46 +1428,56 @@ class MainWindow(QMainWindow):
                 return item
         return None
 
-    def create_item_from_data(self, data, x, y, scale=1.0, rotation=0, zIndex=0, group_id=None, record_undo=True):
+    def create_item_from_data(self, data, x, y, scale=1.0, rotation=0, zIndex=0, group_id=None, record_undo=True,
+                              source_path=None, lazy=False, source_size=None, pixmap_key=None):
         """
         从二进制数据创建图片项（自适应色深）/ Create image item from binary data (adaptive color depth)
         record_undo: 是否记录到撤销历史 / Whether to record to undo history
-        """
-        # ── 自适应色深：先检测数据位深，再选择最佳格式加载 ──
-        cdm = self._get_color_depth_manager()
-        depth_info = cdm.detect_depth_from_data(data)
-        
-        # 如果是高位深图像且非强制8bit模式，使用 QImage 加载以保留精度
-        if depth_info.is_high_bit_depth and cdm.mode != ColorDepthMode.FORCE_8BIT:
-            image = QImage()
-            if image.loadFromData(data):
-                image = cdm.convert_image(image)
-                pixmap = QPixmap.fromImage(image)
-            else:
-                pixmap = QPixmap()
-                pixmap.loadFromData(data)
-        else:
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
+        source_path: data 为 None 时直接从该文件解码 / Decode straight from this file when data is None
+        lazy: 只读取文件头中的尺寸，推迟到首次绘制时再解码 / Only read the size from the header and defer decoding until first painted
+        source_size: lazy 时已知的原图尺寸（看板清单中记录），省去读取文件头 / Known original size for lazy items (from the board manifest), skips the header read
+        pixmap_key: 已知的缓存键（读取看板时在工作线程中算好），省去主线程上的摘要计算 / Known cache key (computed on the board reader's workers), skips digesting on the GUI thread
+        """
+        source = data if data is not None else source_path
+        if lazy:
+            if source_size is None or not source_size.isValid():
+                source_size = read_image_size(source)
+            if source_size.isValid():
+                item = RefItem.deferred(data, source_size, source_path, pixmap_key)
+                return self._add_created_item(item, x, y, scale, rotation, zIndex, group_id, record_undo)
+        
+        # ── 单次解码（超大图缩小解码，高位深图像保留精度），相同字节命中 QPixmapCache 直接复用 ──
+        # Decode once (large images shrink on load, high bit depth keeps precision); identical bytes hit QPixmapCache
+        # 可快速缩小解码的大图（JPEG/WebP）先显示预览，完整版本在后台解码后替换
+        # Large images that scale cheaply (JPEG/WebP) show a preview first; the full version replaces it after a background decode
+        pixmap, source_size, pixmap_key, preview = load_item_pixmap(source, self.view.decodeMaxSide(), pixmap_key)
         if not pixmap.isNull():
-            item = RefItem(pixmap, data)
-            item.setPos(x, y)
-            item.setScale(scale)
-            item.setRotation(rotation)
-            item.setZValue(zIndex)  # 设置图层顺序 / Set layer order
-            item.group_id = group_id  # 设置组ID / Set group ID
-            self.scene.addItem(item)
-            
-            # 记录添加操作到撤销历史 / Record add action to undo history
-            if record_undo:
-                self.undo_manager.push(AddItemCommand(self.scene, item))
-            
-            self.view.markBoardBoundsDirty()
-            self.view.scheduleViewportUpdate()
+            item = self._add_created_item(RefItem(pixmap, data, source_size, pixmap_key, source_path),
+                                          x, y, scale, rotation, zIndex, group_id, record_undo)
+            if preview:
+                item.request_full_pixmap()
             return item
-        else:
-            print("Failed to load pixmap from data")
-            return None
+        print("Failed to load pixmap from data")
+        return None
+
+    def _add_created_item(self, item, x, y, scale, rotation, zIndex, group_id, record_undo):
+        """
+        设置新图片项的变换并加入场景 / Apply a new item's transform and add it to the scene
+        """
+        item.setPos(x, y)
+        item.setScale(scale)
+        item.setRotation(rotation)
+        item.setZValue(zIndex)  # 设置图层顺序 / Set layer order
+        item.group_id = group_id  # 设置组ID / Set group ID
+        self.scene.addItem(item)
+        
+        # 记录添加操作到撤销历史 / Record add action to undo history
+        if record_undo:
+            self.undo_manager.push(AddItemCommand(self.scene, item))
+        
+        self.view.markBoardBoundsDirty()
+        self.view.scheduleViewportUpdate()
+        return item
 
     def delete_selected(self):
         """
@@ -1435,8 +1517,11 @@ class MainWindow(QMainWindow):
         self._copied_items = []
         for item in selected:
             self._copied_items.append({
-                'pixmap': item.pixmap(),         # QPixmap 引用，零拷贝
-                'image_data': item.image_data,   # bytes 引用，零拷贝
+                'pixmap': item.full_pixmap(),    # QPixmap 引用，零拷贝
+                'image_data': item.image_data,   # QByteArray 隐式共享，零拷贝
+                'source_size': item.source_size(),
+                'pixmap_key': item._pixmap_key,
+                'source_path': item.source_path,
                 'x': item.x(),
                 'y': item.y(),
                 'scale': item.scale(),
@@ -1457,7 +1542,8 @@ class MainWindow(QMainWindow):
             offset = 30  # 偏移避免重叠 / Offset to avoid overlap
             new_items = []
             for info in self._copied_items:
-                item = RefItem(info['pixmap'], info['image_data'])
+                item = RefItem(info['pixmap'], info['image_data'], info['source_size'], info['pixmap_key'],
+                               info['source_path'])
                 item.setPos(info['x'] + offset, info['y'] + offset)
                 item.setScale(info['scale'])
                 item.setRotation(info['rotation'])
@@ -1485,33 +1571,65 @@ class MainWindow(QMainWindow):
                 # Direct QImage → QPixmap, skip PNG encode/decode
                 self.create_item_from_image(image, center.x(), center.y())
         elif mime_data.hasUrls():
-            offset = 0
-            for url in mime_data.urls():
-                if url.isLocalFile():
-                    self.load_image_file(url.toLocalFile(), center.x() + offset, center.y() + offset)
-                    offset += 20
+            paths = [url.toLocalFile() for url in mime_data.urls() if url.isLocalFile()]
+            self.load_image_files_async(paths, center.x(), center.y())
         elif mime_data.hasText():
             # Try to parse paths from text
             text = mime_data.text()
-            lines = text.split('\n')
-            offset = 0
-            for line in lines:
-                path = line.strip().strip('"')
-                if os.path.exists(path) and os.path.isfile(path):
-                    self.load_image_file(path, center.x() + offset, center.y() + offset)
-                    offset += 20
+            paths = [line.strip().strip('"') for line in text.split('\n')]
+            paths = [path for path in paths if path]
+            existing = self._existing_files(paths)
+            self.load_image_files_async([path for path in paths if path in existing], center.x(), center.y())
+
+    def _existing_files(self, paths):
+        """
+        返回 paths 中确实存在的文件：按所在目录分组，同一目录下的多个路径只列一次目录，
+        而不是逐个 stat（网络驱动器上每次 stat 都是一次往返）
+        Return the entries of paths that are existing files: paths are grouped by directory and a directory
+        holding several of them is listed once instead of stat-ing each path (every stat is a round trip on
+        network drives)
+        """
+        by_dir = {}
+        for path in paths:
+            by_dir.setdefault(os.path.dirname(path), []).append(path)
+        existing = set()
+        for directory, dir_paths in by_dir.items():
+            if len(dir_paths) > 1:
+                try:
+                    # Windows 上文件名不区分大小写，按 normcase 比较 / Names are case-insensitive on Windows, compared via normcase
+                    with os.scandir(directory or os.curdir) as entries:
+                        files = {os.path.normcase(entry.name) for entry in entries if entry.is_file()}
+                except OSError:
+                    pass
+                else:
+                    existing.update(path for path in dir_paths if os.path.normcase(os.path.basename(path)) in files)
+                    continue
+            # isfile 已隐含 exists，只需一次 stat / isfile implies exists, a single stat is enough
+            existing.update(path for path in dir_paths if os.path.isfile(path))
+        return existing
 
     def clear_board(self):
         """
         清空画布 / Clear board
         """
-        items = [item for item in self.scene.items() if isinstance(item, RefItem)]
+        items = self.view.refItems()
         if items:
             # 记录清空操作到撤销历史 / Record clear action to undo history
             self.undo_manager.push(ClearBoardCommand(self.scene, items))
         
         # 移除所有 RefItem（而不是 clear，以便保留其他可能的场景元素）
-        for item in items:
+        self.view.setBulkInsert(True)
+        self._remove_ref_items(items)
+        self.view.setBulkInsert(False)
+
+    def _remove_ref_items(self, items):
+        """
+        从场景中批量移除图片 / Remove many images from the scene
+        按加入顺序倒序移除：Qt 从顶层图形项列表末尾移除为 O(1)，从中间移除会使之后每次移除都退化为线性查找
+        Removed in reverse insertion order: Qt drops items off the end of its top-level list in O(1), while a
+        removal from the middle degrades every later removal to a linear search
+        """
+        for item in reversed(items):
             self.scene.removeItem(item)
     
     def reset_board_to_fit_images(self):
@@ -1547,39 +1665,104 @@ class MainWindow(QMainWindow):
         """
         保存看板到文件 / Save board to file
         """
-        path, _ = QFileDialog.getSaveFileName(self, tr("save_board"), "", "SimpleRef Board (*.sref);;JSON (*.json)")
+        if self._board_saving:
+            return
+        # .srefz 为 ZIP 容器（保存/读取最快）；.sref 为旧版 JSON，可在 macOS 版本中打开
+        # .srefz is the ZIP container (fastest to save/load); .sref is legacy JSON and opens in the macOS app
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, tr("save_board"), "",
+            "SimpleRef Archive (*.srefz);;SimpleRef Board (*.sref);;JSON (*.json)")
         if not path:
             return
+        if not path.lower().endswith((BOARD_ARCHIVE_EXT, '.sref', '.json')):
+            if 'Archive' in selected_filter:
+                path += BOARD_ARCHIVE_EXT
+            elif 'JSON' in selected_filter:
+                path += '.json'
+            else:
+                path += '.sref'
             
-        items_data = []
-        for item in self.scene.items():
-            if isinstance(item, RefItem):
-                items_data.append(item.to_dict())
+        ref_items = self.view.refItems()
+        
+        # 源文件已移动/删除且只剩缩小解码的 pixmap：保存会永久丢失分辨率，提示用户后放弃保存
+        # Source file moved/deleted with only a scaled-down pixmap left: saving would lose resolution
+        # for good, so warn and abort the save
+        missing = [str(item.source_path) for item in ref_items if not item.has_full_copy()]
+        if missing:
+            QMessageBox.warning(self, tr("warning"), tr("save_source_missing").format("\n".join(missing)))
+            return
+        
+        # 粘贴的图片没有原始字节：主线程只快照 QImage，无损编码由保存任务在工作线程中完成，结果随完成信号交回
+        # Pasted images have no original bytes: the main thread only snapshots a QImage; the lossless encode
+        # happens in the save task on workers and the bytes come back with the finished signal
+        # 旧版 JSON 供 macOS 版本读取，新编码的图片仍使用 PNG；ZIP 容器使用 WebP 无损
+        # Legacy JSON is read by the macOS app, so newly encoded images stay PNG; the ZIP container uses lossless WebP
+        fmt = None if path.lower().endswith(BOARD_ARCHIVE_EXT) else "PNG"
+        items_data = [item.to_dict() for item in ref_items]
+        self._save_encode_items = [item for item, data in zip(ref_items, items_data) if data["image"] is not None]
         
         # 保存组信息 / Save group info
         groups_data = []
         for group_id, group_item in self.groups.items():
             groups_data.append(group_item.to_dict())
         
-        # 构建包含组信息的数据 / Build data with group info
-        board_data = {
-            "version": 4,  # 版本4添加组功能 / Version 4 adds group feature
-            "images": items_data,
-            "groups": groups_data
-        }
-        
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(board_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            QMessageBox.critical(self, tr("error"), tr("save_error").format(str(e)))
+        # 编码与写盘在工作线程进行（ZIP 容器：原始图片字节 + 清单），超过 200ms 才显示进度框
+        # Encoding and writing run on a worker (ZIP container: raw image bytes + manifest);
+        # the progress dialog only appears if it takes longer than 200ms
+        self._board_saving = True
+        self._board_pool.start(BoardSaveTask(self.vm, path, items_data, groups_data, self._board_io_signals, fmt))
+        QTimer.singleShot(200, self._show_save_progress)
+
+    def _show_save_progress(self):
+        """
+        保存耗时较长时显示不可取消的进度框 / Show a non-cancellable progress dialog for slow saves
+        """
+        if not self._board_saving or self._save_progress is not None:
+            return
+        dialog = QProgressDialog(tr("saving_board"), "", 0, 0, self)
+        dialog.setCancelButton(None)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.show()
+        self._save_progress = dialog
+
+    def _on_board_saved(self, success, error, encoded):
+        """
+        后台保存完成（主线程）：保留新编码的图片字节，下次保存无需再次编码
+        Background save finished (main thread): keep the newly encoded image bytes so the next save need not encode again
+        """
+        for item, data in zip(self._save_encode_items, encoded):
+            if item.image_data is None:
+                item.image_data = data
+        self._save_encode_items = []
+        self._board_saving = False
+        if self._save_progress is not None:
+            self._save_progress.close()
+            self._save_progress = None
+        if not success:
+            QMessageBox.critical(self, tr("error"), tr("save_error").format(error))
+
+    def _render_full_resolution(self, painter, target, rect, items):
+        """
+        以完整分辨率渲染场景：先同步解码尚未解码、已离屏释放或仅有预览的图片（否则会导出为灰色占位块或低分辨率预览），
+        渲染后把原先已释放的图片重新释放，恢复 LOD 状态
+        Render the scene at full resolution: items that are still deferred, evicted off-screen or showing only
+        a preview are decoded synchronously first (they would otherwise export as grey placeholder blocks or
+        low-res previews); items that were evicted are evicted again afterwards to restore the LOD state
+        """
+        evicted = [item for item in items if item._evicted]
+        for item in items:
+            item.full_pixmap()
+        self.scene.render(painter, target, rect)
+        for item in evicted:
+            item.evict_pixmap()
 
     def export_board_to_image(self):
         """
         导出画布为图片 / Export board as image
         """
         # 获取场景中所有内容的边界矩形
-        items = [item for item in self.scene.items() if isinstance(item, RefItem)]
+        items = self.view.refItems()
         if not items:
             QMessageBox.warning(self, tr("warning"), tr("no_images_to_export"))
             return
@@ -1624,10 +1807,14 @@ class MainWindow(QMainWindow):
         # 检测画布上图像的最高位深
         max_depth_info = None
         for item in items:
-            if isinstance(item, RefItem) and item.image_data:
+            if isinstance(item, RefItem) and item.image_data is not None:
                 info = cdm.detect_depth_from_data(item.image_data)
-                if max_depth_info is None or info.bits_per_channel > max_depth_info.bits_per_channel:
-                    max_depth_info = info
+            elif isinstance(item, RefItem) and item.source_path is not None:
+                info = cdm.detect_depth_from_file(item.source_path)
+            else:
+                continue
+            if max_depth_info is None or info.bits_per_channel > max_depth_info.bits_per_channel:
+                max_depth_info = info
         if max_depth_info is None:
             from Models.ColorDepthManager import ImageColorDepthInfo
             max_depth_info = ImageColorDepthInfo()
@@ -1650,7 +1837,7 @@ class MainWindow(QMainWindow):
         # target: 目标绘制区域（整个图片）
         # source: 场景中要渲染的区域
         target = QRectF(0, 0, width, height)
-        self.scene.render(painter, target, rect)
+        self._render_full_resolution(painter, target, rect, items)
         painter.end()
         
         # 保存图片
@@ -1664,7 +1851,7 @@ class MainWindow(QMainWindow):
         导出画布到剪贴板 / Export board to clipboard
         """
         # 获取场景中所有内容的边界矩形
-        items = [item for item in self.scene.items() if isinstance(item, RefItem)]
+        items = self.view.refItems()
         if not items:
             QMessageBox.warning(self, tr("warning"), tr("no_images_to_export"))
             return
@@ -1686,10 +1873,14 @@ class MainWindow(QMainWindow):
         cdm = self._get_color_depth_manager()
         max_depth_info = None
         for item in items:
-            if isinstance(item, RefItem) and item.image_data:
+            if isinstance(item, RefItem) and item.image_data is not None:
                 info = cdm.detect_depth_from_data(item.image_data)
-                if max_depth_info is None or info.bits_per_channel > max_depth_info.bits_per_channel:
-                    max_depth_info = info
+            elif isinstance(item, RefItem) and item.source_path is not None:
+                info = cdm.detect_depth_from_file(item.source_path)
+            else:
+                continue
+            if max_depth_info is None or info.bits_per_channel > max_depth_info.bits_per_channel:
+                max_depth_info = info
         if max_depth_info is None:
             from Models.ColorDepthManager import ImageColorDepthInfo
             max_depth_info = ImageColorDepthInfo()
@@ -1706,7 +1897,7 @@ class MainWindow(QMainWindow):
         # target: 目标绘制区域（整个图片）
         # source: 场景中要渲染的区域
         target = QRectF(0, 0, width, height)
-        self.scene.render(painter, target, rect)
+        self._render_full_resolution(painter, target, rect, items)
         painter.end()
         
         # 复制到剪贴板
@@ -1717,82 +1908,145 @@ class MainWindow(QMainWindow):
         """
         从文件加载看板 / Load board from file
         """
-        path, _ = QFileDialog.getOpenFileName(self, tr("load_board"), "", "SimpleRef Board (*.sref);;JSON (*.json)")
+        path, _ = QFileDialog.getOpenFileName(self, tr("load_board"), "", "SimpleRef Board (*.srefz *.sref);;JSON (*.json)")
         if not path:
             return
         
+        # 自动识别 ZIP 容器 / 旧版 JSON 格式；先取出第一条记录，确保文件可读后再清空画布
+        # Auto-detect ZIP container or legacy JSON; pull the first record so the file is known
+        # to be readable before the board is cleared
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                board_data = json.load(f)
-            
-            # 清空画布但不记录撤销（加载看板是完整替换）
-            items = [item for item in self.scene.items() if isinstance(item, RefItem)]
-            for item in items:
-                self.scene.removeItem(item)
-            
-            # 清空现有组 / Clear existing groups
-            for group_item in self.groups.values():
-                self.scene.removeItem(group_item)
-            self.groups.clear()
-            
-            # 清空撤销历史 / Clear undo history
-            self.undo_manager.clear()
+            records = self.vm.iter_board_data(path)
+            first = next(records, None)
+        except Exception as e:
+            QMessageBox.critical(self, tr("error"), tr("load_error").format(str(e)))
+            return
+        
+        # 取消尚未完成的上一次加载 / Cancel a previous load that is still running
+        self._cancel_board_load()
+        
+        # 批量增删期间不维护场景索引，加载结束后一次性建立 / No scene index upkeep during the bulk replace, built once when loading ends
+        self.view.setBulkInsert(True)
+        
+        # 清空现有组 / Clear existing groups
+        # 组在图片之后加入场景，先移除组，保证下面倒序移除图片时每次都是顶层列表的末尾
+        # Groups are added after the images, so they go first and the reversed image removal below always hits the end of the top-level list
+        for group_item in self.groups.values():
+            self.scene.removeItem(group_item)
+        self.groups.clear()
+        
+        # 清空画布但不记录撤销（加载看板是完整替换）
+        # Clear the canvas without undo (loading a board is a full replace)
+        self._remove_ref_items(self.view.refItems())
+        
+        # 清空撤销历史 / Clear undo history
+        self.undo_manager.clear()
+        
+        if first is None:
+            self.view.setBulkInsert(False)
+            return
+        
+        # 每个事件循环周期在时间预算内创建若干图片，加载过程中界面保持响应
+        # Create images within a time budget per event-loop tick so the UI stays responsive while loading
+        self._board_load_records = records
+        self._board_load_pending = first
+        self._board_load_groups = []
+        QTimer.singleShot(0, self._load_board_step)
+
+    def _load_board_step(self):
+        """
+        增量加载看板的单步：在时间预算内处理若干记录后让出事件循环
+        Incremental board load step: handle records until the time budget is spent, then yield to the event loop
+        """
+        records = self._board_load_records
+        if records is None:
+            return
+        
+        deadline = time.perf_counter() + self.BOARD_LOAD_STEP_BUDGET
+        while True:
+            try:
+                if self._board_load_pending is not None:
+                    record, self._board_load_pending = self._board_load_pending, None
+                else:
+                    record = next(records, None)
+            except Exception as e:
+                self._cancel_board_load()
+                QMessageBox.critical(self, tr("error"), tr("load_error").format(str(e)))
+                return
             
-            # 处理不同版本的存档格式 / Handle different save format versions
-            if isinstance(board_data, list):
-                # 旧版本格式（纯数组）/ Old format (pure array)
-                images_data = board_data
-                groups_data = []
-            else:
-                # 新版本格式（带版本号的对象）/ New format (object with version)
-                images_data = board_data.get("images", [])
-                groups_data = board_data.get("groups", [])
+            if record is None:
+                self._finish_board_load()
+                return
             
-            # 解码图片数据 / Decode image data
-            for img_data in images_data:
-                b64_data = img_data.get("data", "")
-                try:
-                    decoded_data = base64.b64decode(b64_data)
-                except:
-                    continue
-                
+            kind, data = record
+            if kind == "image":
                 self.create_item_from_data(
-                    decoded_data, 
-                    img_data.get("x", 0), 
-                    img_data.get("y", 0),
-                    img_data.get("scale", 1.0),
-                    img_data.get("rotation", 0),
-                    img_data.get("zIndex", 0),
-                    img_data.get("groupId", None),
-                    record_undo=False
-                )
-            
-            # 加载组信息 / Load group info
-            for group_data in groups_data:
-                group_item = GroupItem(
-                    group_id=group_data.get("id"),
-                    name=group_data.get("name", ""),
-                    color=QColor(group_data.get("color", "#6495ED")),
-                    opacity=group_data.get("opacity", 0.3),
-                    font_size=group_data.get("font_size", 14)
-                )
-                rect = QRectF(
-                    group_data.get("x", 0),
-                    group_data.get("y", 0),
-                    group_data.get("width", 100),
-                    group_data.get("height", 100)
+                    data["data"], 
+                    data["x"], 
+                    data["y"],
+                    data["scale"],
+                    data["rotation"],
+                    data["zIndex"],
+                    data["groupId"],
+                    record_undo=False,
+                    lazy=True,
+                    source_size=QSize(data["width"], data["height"]) if data["width"] and data["height"] else None,
+                    pixmap_key=data["key"]
                 )
-                group_item.setRect(rect)
-                self.scene.addItem(group_item)
-                self.groups[group_item.group_id] = group_item
+            elif kind == "group":
+                self._board_load_groups.append(data)
             
-            # 更新所有组的边界（几何交集会自动判定成员，无需显式维护 member_ids）
-            # Update all group bounds (geometric intersection auto-determines members, no member_ids needed)
-            for group_item in self.groups.values():
-                self.update_group_bounds(group_item)
-            
-        except Exception as e:
-            QMessageBox.critical(self, tr("error"), tr("load_error").format(str(e)))
+            if time.perf_counter() >= deadline:
+                break
+        
+        QTimer.singleShot(0, self._load_board_step)
+
+    def _finish_board_load(self):
+        """
+        所有图片创建完毕后恢复组信息 / Restore groups once all images have been created
+        """
+        groups_data = self._board_load_groups
+        self._board_load_records = None
+        self._board_load_pending = None
+        self._board_load_groups = []
+        
+        # 加载组信息 / Load group info
+        for group_data in groups_data:
+            group_item = GroupItem(
+                group_id=group_data.get("id"),
+                name=group_data.get("name", ""),
+                color=QColor(group_data.get("color", "#6495ED")),
+                opacity=group_data.get("opacity", 0.3),
+                font_size=group_data.get("font_size", 14)
+            )
+            rect = QRectF(
+                group_data.get("x", 0),
+                group_data.get("y", 0),
+                group_data.get("width", 100),
+                group_data.get("height", 100)
+            )
+            group_item.setRect(rect)
+            self.scene.addItem(group_item)
+            self.groups[group_item.group_id] = group_item
+        
+        # 更新所有组的边界（几何交集会自动判定成员，无需显式维护 member_ids）
+        # Update all group bounds (geometric intersection auto-determines members, no member_ids needed)
+        for group_item in self.groups.values():
+            self.update_group_bounds(group_item)
+        
+        # 按最终图片数量建立场景索引 / Build the scene index for the final image count
+        self.view.setBulkInsert(False)
+
+    def _cancel_board_load(self):
+        """
+        中止正在进行的增量加载并关闭文件 / Abort an in-progress incremental load and close the file
+        """
+        if self._board_load_records is not None:
+            self._board_load_records.close()
+        self._board_load_records = None
+        self._board_load_pending = None
+        self._board_load_groups = []
+        self.view.setBulkInsert(False)
 
     # ========== 撤销/重做相关方法 / Undo/Redo related methods ==========
     
@@ -1842,7 +2096,7 @@ class MainWindow(QMainWindow):
             return
         
         # 获取所有 RefItem 并按 z-value 排序
-        all_items = [item for item in self.scene.items() if isinstance(item, RefItem)]
+        all_items = self.view.refItems()
         all_items.sort(key=lambda x: x.zValue())
         
         # 找到最大 z-value
@@ -1876,7 +2130,7 @@ class MainWindow(QMainWindow):
             return
         
         # 获取所有 RefItem 并按 z-value 排序
-        all_items = [item for item in self.scene.items() if isinstance(item, RefItem)]
+        all_items = self.view.refItems()
         all_items.sort(key=lambda x: x.zValue())
         
         # 找到最小 z-value
@@ -1910,7 +2164,7 @@ class MainWindow(QMainWindow):
             return
         
         # 获取所有 RefItem 的最大 z-value
-        all_items = [item for item in self.scene.items() if isinstance(item, RefItem)]
+        all_items = self.view.refItems()
         max_z = max(item.zValue() for item in all_items) if all_items else 0
         
         # 按原始 z-value 排序，保持相对顺序
@@ -1930,7 +2184,7 @@ class MainWindow(QMainWindow):
             return
         
         # 获取所有 RefItem 的最小 z-value
-        all_items = [item for item in self.scene.items() if isinstance(item, RefItem)]
+        all_items = self.view.refItems()
         min_z = min(item.zValue() for item in all_items) if all_items else 0
         
         # 按原始 z-value 排序（降序），保持相对顺序
@@ -2065,8 +2319,8 @@ class MainWindow(QMainWindow):
         
         # 更新成员的 group_id 标记 / Update group_id tags for members
         # 先清除所有旧标记 / Clear old tags first
-        for item in self.scene.items():
-            if isinstance(item, RefItem) and hasattr(item, 'group_id') and item.group_id == group_item.group_id:
+        for item in self.view.refItems():
+            if item.group_id == group_item.group_id:
                 if item not in current_members:
                     item.group_id = None
         
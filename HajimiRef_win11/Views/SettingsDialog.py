@@ -1,6 +1,6 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QColorDialog, QSpinBox, QCheckBox, QTabWidget, QWidget, QComboBox, QGroupBox, QSlider, QMessageBox)
-from PySide6.QtCore import Qt
-from Config import Config, tr
+from PySide6.QtCore import Qt, QTimer
+from Config import Config, tr, tr_batch
 
 class SettingsDialog(QDialog):
     """
@@ -13,8 +13,27 @@ class SettingsDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle(tr("preferences"))
         self.resize(400, 350)
+        # 画布刷新去抖：按住方向键或拖动滑块时连续的数值变化只触发一次重绘
+        # Canvas refresh debounce: a burst of value changes (held arrow keys, slider drags) repaints once
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(50)
+        self._update_timer.timeout.connect(self._update_canvas)
         self.setup_ui()
 
+    def _schedule_canvas_update(self):
+        """
+        调度一次画布重绘（50ms 内的多次调用合并为一次）/ Schedule a canvas repaint (calls within 50ms are merged)
+        """
+        self._update_timer.start()
+
+    def _update_canvas(self):
+        """
+        重绘画布 / Repaint the canvas
+        """
+        if self.parent():
+            self.parent().view.viewport().update()
+
     def setup_ui(self):
         """
         设置 UI 布局和控件 / Setup UI layout and widgets
@@ -328,7 +347,7 @@ class SettingsDialog(QDialog):
         if color.isValid():
             Config.bg_color = color
             self.update_color_btn(self.btn_bg_color, color)
-            self.parent().view.viewport().update()
+            self._schedule_canvas_update()
 
     def pick_grid_color(self):
         """
@@ -338,7 +357,7 @@ class SettingsDialog(QDialog):
         if color.isValid():
             Config.grid_color = color
             self.update_color_btn(self.btn_grid_color, color)
-            self.parent().view.viewport().update()
+            self._schedule_canvas_update()
 
     def pick_ue5_bg_color(self):
         """选择 UE5 蓝图背景颜色 / Pick UE5 blueprint background color"""
@@ -346,7 +365,7 @@ class SettingsDialog(QDialog):
         if color.isValid():
             Config.ue5_bg_color = color
             self.update_color_btn(self.btn_ue5_bg_color, color)
-            self.parent().view.viewport().update()
+            self._schedule_canvas_update()
 
     def pick_ue5_small_grid_color(self):
         """选择 UE5 小网格颜色 / Pick UE5 small grid color"""
@@ -354,7 +373,7 @@ class SettingsDialog(QDialog):
         if color.isValid():
             Config.ue5_small_grid_color = color
             self.update_color_btn(self.btn_ue5_small_grid, color)
-            self.parent().view.viewport().update()
+            self._schedule_canvas_update()
 
     def pick_ue5_large_grid_color(self):
         """选择 UE5 大网格颜色 / Pick UE5 large grid color"""
@@ -362,51 +381,51 @@ class SettingsDialog(QDialog):
         if color.isValid():
             Config.ue5_large_grid_color = color
             self.update_color_btn(self.btn_ue5_large_grid, color)
-            self.parent().view.viewport().update()
+            self._schedule_canvas_update()
 
     def set_ue5_large_grid_multiplier(self, val):
         """设置 UE5 大网格倍数 / Set UE5 large grid multiplier"""
         Config.ue5_large_grid_multiplier = val
-        self.parent().view.viewport().update()
+        self._schedule_canvas_update()
 
     def set_ue5_small_line_width(self, val):
         """设置 UE5 小网格线宽 / Set UE5 small grid line width"""
         Config.ue5_small_line_width = float(val)
-        self.parent().view.viewport().update()
+        self._schedule_canvas_update()
 
     def set_ue5_large_line_width(self, val):
         """设置 UE5 大网格线宽 / Set UE5 large grid line width"""
         Config.ue5_large_line_width = float(val)
-        self.parent().view.viewport().update()
+        self._schedule_canvas_update()
 
     def set_ue5_small_line_alpha(self, val):
         """设置 UE5 小网格线透明度 / Set UE5 small grid line alpha"""
         Config.ue5_small_line_alpha = val
-        self.parent().view.viewport().update()
+        self._schedule_canvas_update()
 
     def set_ue5_large_line_alpha(self, val):
         """设置 UE5 大网格线透明度 / Set UE5 large grid line alpha"""
         Config.ue5_large_line_alpha = val
-        self.parent().view.viewport().update()
+        self._schedule_canvas_update()
 
     def set_dot_size(self, val):
         """设置点阵点大小 / Set dot grid dot size"""
         Config.dot_size = val
-        self.parent().view.viewport().update()
+        self._schedule_canvas_update()
 
     def set_grid_size(self, val):
         """
         设置网格大小 / Set grid size
         """
-        Config.grid_size = val
-        self.parent().view.viewport().update()
+        Config.set_grid_size(val)
+        self._schedule_canvas_update()
 
     def set_grid_enabled(self, val):
         """
         设置是否显示网格 / Set grid enabled
         """
         Config.grid_enabled = val
-        self.parent().view.viewport().update()
+        self._schedule_canvas_update()
 
     def set_canvas_theme(self, index):
         """
@@ -416,7 +435,7 @@ class SettingsDialog(QDialog):
         if theme:
             Config.canvas_theme = theme
             self._update_theme_options_visibility()
-            self.parent().view.viewport().update()
+            self._schedule_canvas_update()
 
     def set_bg_opacity(self, val):
         """
@@ -477,21 +496,23 @@ class SettingsDialog(QDialog):
         if self.parent():
             self.parent().change_language(lang_code)
             # Refresh this dialog title/tabs
-            self.setWindowTitle(tr("preferences"))
-            self.tabs.setTabText(0, tr("appearance"))
-            self.tabs.setTabText(1, tr("board_settings"))
-            self.tabs.setTabText(2, tr("language"))
+            t = tr_batch(("preferences", "appearance", "board_settings", "language", "show_grid",
+                          "acrylic_effect", "theme_dot_grid", "theme_ue5_blueprint"))
+            self.setWindowTitle(t["preferences"])
+            self.tabs.setTabText(0, t["appearance"])
+            self.tabs.setTabText(1, t["board_settings"])
+            self.tabs.setTabText(2, t["language"])
             # 刷新控件文本
-            self.chk_grid.setText(tr("show_grid"))
-            self.chk_acrylic.setText(tr("acrylic_effect"))
+            self.chk_grid.setText(t["show_grid"])
+            self.chk_acrylic.setText(t["acrylic_effect"])
             # 刷新选项组标题
-            self.dot_grid_group.setTitle(tr("theme_dot_grid"))
-            self.ue5_group.setTitle(tr("theme_ue5_blueprint"))
+            self.dot_grid_group.setTitle(t["theme_dot_grid"])
+            self.ue5_group.setTitle(t["theme_ue5_blueprint"])
             # 刷新画板主题下拉框文本 / Refresh canvas theme combo text
             current_theme_data = self.combo_canvas_theme.currentData()
             self.combo_canvas_theme.clear()
-            self.combo_canvas_theme.addItem(tr("theme_dot_grid"), "dot_grid")
-            self.combo_canvas_theme.addItem(tr("theme_ue5_blueprint"), "ue5_blueprint")
+            self.combo_canvas_theme.addItem(t["theme_dot_grid"], "dot_grid")
+            self.combo_canvas_theme.addItem(t["theme_ue5_blueprint"], "ue5_blueprint")
             idx = self.combo_canvas_theme.findData(current_theme_data)
             if idx >= 0:
                 self.combo_canvas_theme.setCurrentIndex(idx)
@@ -537,6 +558,6 @@ class SettingsDialog(QDialog):
         if index >= 0:
             self.combo_lang.setCurrentIndex(index)
             
-        self.parent().view.viewport().update()
+        self._schedule_canvas_update()
         if self.parent():
             self.parent().change_language(Config.language)
@@ -19,7 +19,9 @@ LANGUAGES = {
         "about_text": "SimpleRef (GPU)\nA GPU-accelerated reference image viewer.\n\nControls:\n- Right Click: Menu\n- Left Drag: Move Image\n- Middle Drag / Space + Left Drag: Pan Canvas\n- Wheel: Zoom Canvas\n- Delete: Remove Image\n- G: Group Selected Images",
         "error": "Error",
         "save_error": "Failed to save file: {}",
+        "save_source_missing": "These images were moved, deleted or changed since they were added, and only a reduced-resolution copy is loaded. Restore the files or remove the images, then save again:\n{}",
         "load_error": "Failed to load file: {}",
+        "saving_board": "Saving board...",
         "appearance": "Appearance",
         "bg_color": "Background Color",
         "grid_color": "Grid Color",
@@ -114,7 +116,9 @@ LANGUAGES = {
         "about_text": "SimpleRef (GPU)\n一个基于 GPU 加速的参考图查看器。\n\n操作说明:\n- 右键: 菜单\n- 左键拖拽: 移动图片\n- 中键拖拽 / 空格+左键: 移动画布\n- 滚轮: 缩放画布\n- Delete: 删除图片\n- G: 打组选中图片",
         "error": "错误",
         "save_error": "保存文件失败: {}",
+        "save_source_missing": "以下图片的源文件在添加后已被移动、删除或修改，当前只载入了降低分辨率的副本。请恢复文件或移除这些图片后再保存：\n{}",
         "load_error": "读取文件失败: {}",
+        "saving_board": "正在保存看板…",
         "appearance": "外观",
         "bg_color": "背景颜色",
         "grid_color": "网格颜色",
@@ -0,0 +1,214 @@
+"""
+看板保存/读取往返测试 / Board save/load round-trip tests
+"""
+
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QColor, QImage
+
+import ViewModels.MainViewModel as board
+from Models.ImageLoader import bytes_cache_key
+from ViewModels.MainViewModel import MainViewModel
+
+GROUPS = [{"id": "g1", "name": "Group", "x": 1.0, "y": 2.0, "width": 30.0, "height": 40.0}]
+
+
+def _image_bytes(color, fmt="PNG", width=24, height=16):
+    """
+    生成纯色图片字节 / Encode a solid-colour image
+    """
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor(*color))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, fmt)
+    buffer.close()
+    return data
+
+
+def _item(data=None, path=None, index=0):
+    """
+    与 RefItem.to_dict() 相同结构的图片记录 / An image record shaped like RefItem.to_dict()
+    """
+    return {
+        "x": 10.0 * index, "y": -5.0 * index, "scale": 1.5, "rotation": 90.0, "zIndex": float(index),
+        "data": data, "path": path, "width": 24, "height": 16, "groupId": "g1" if index % 2 else None,
+    }
+
+
+def _load(path):
+    """
+    读取看板，返回 (图片记录列表, 组列表) / Read a board, returning (image records, groups)
+    """
+    images, groups = [], []
+    for kind, record in MainViewModel().iter_board_data(path):
+        (images if kind == "image" else groups).append(record)
+    return images, groups
+
+
+def _save(path, items, groups=GROUPS):
+    success, error = MainViewModel().save_board_data(str(path), items, groups)
+    assert success, error
+
+
+def _assert_round_trip(items, images, payloads):
+    assert len(images) == len(items)
+    for item, record, payload in zip(items, images, payloads):
+        for key in ("x", "y", "scale", "rotation", "zIndex", "groupId"):
+            assert record[key] == item[key]
+        assert bytes(record["data"]) == bytes(payload)
+        assert record["key"] == bytes_cache_key(payload)
+
+
+@pytest.fixture(params=[True, False], ids=["zstd", "no-zstd"])
+def zstd(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(board, "_zstandard", lambda: None)
+    elif board._zstandard() is None:
+        pytest.skip("zstandard is not installed")
+    return request.param
+
+
+@pytest.fixture(params=[True, False], ids=["ijson", "no-ijson"])
+def ijson(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(board, "_ijson", lambda: None)
+    elif board._ijson() is None:
+        pytest.skip("ijson is not installed")
+    return request.param
+
+
+def test_archive_round_trip(tmp_path, zstd):
+    payloads = [_image_bytes((200, 40, 90)), _image_bytes((10, 20, 30), "BMP"), _image_bytes((5, 5, 5), "JPEG")]
+    items = [_item(data, index=i) for i, data in enumerate(payloads)]
+    path = tmp_path / "board.srefz"
+    _save(path, items)
+
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+    manifest = board.MANIFEST_NAME + (board.ZSTD_SUFFIX if zstd else "")
+    assert manifest in names
+    # 只有未压缩格式（BMP）的图片条目经 zstd 压缩 / Only the uncompressed format (BMP) entry is zstd-compressed
+    assert ("images/1.bmp.zst" in names) == zstd
+    assert "images/0.png" in names and "images/2.jpg" in names
+
+    images, groups = _load(path)
+    _assert_round_trip(items, images, payloads)
+    assert groups == GROUPS
+    assert (images[0]["width"], images[0]["height"]) == (24, 16)
+
+
+@pytest.mark.parametrize("ext", [".sref", ".json"])
+def test_legacy_json_round_trip(tmp_path, ext, ijson):
+    payloads = [_image_bytes((200, 40, 90)), _image_bytes((1, 2, 3), "JPEG")]
+    items = [_item(data, index=i) for i, data in enumerate(payloads)]
+    path = tmp_path / ("board" + ext)
+    _save(path, items)
+
+    # macOS 版本读取的结构：带版本号的对象，图片为 Base64 字符串 / The layout the macOS app reads: versioned object, Base64 images
+    with open(path, "rb") as f:
+        content = json.load(f)
+    assert content["version"] == board.LEGACY_JSON_VERSION
+    assert all(isinstance(entry["data"], str) and "path" not in entry for entry in content["images"])
+
+    images, groups = _load(path)
+    _assert_round_trip(items, images, payloads)
+    assert groups == GROUPS
+
+
+def test_legacy_chunked_base64(tmp_path, monkeypatch, ijson):
+    # 超过流式阈值的图片分块编码写出，块边界必须落在 3 字节对齐处 / Images above the threshold are written in aligned chunks
+    monkeypatch.setattr(board, "BASE64_STREAM_MIN", 1)
+    payload = QByteArray(os.urandom(board.BASE64_CHUNK * 2 + 7))
+    source = tmp_path / "big.bin"
+    source.write_bytes(bytes(payload))
+    items = [_item(payload), _item(path=str(source), index=1)]
+    path = tmp_path / "board.sref"
+    _save(path, items)
+
+    images, _ = _load(path)
+    _assert_round_trip(items, images, [payload, payload])
+
+
+def test_legacy_list_form(tmp_path, ijson):
+    payloads = [_image_bytes((9, 9, 9)), _image_bytes((90, 90, 90))]
+    entries = [{"x": 1.0 * i, "y": 2.0, "scale": 1.0, "rotation": 0.0,
+                "data": bytes(payload.toBase64()).decode("ascii")} for i, payload in enumerate(payloads)]
+    path = tmp_path / "old.sref"
+    path.write_text(json.dumps(entries))
+
+    images, groups = _load(path)
+    assert [bytes(record["data"]) for record in images] == [bytes(payload) for payload in payloads]
+    assert [record["x"] for record in images] == [0.0, 1.0]
+    assert images[0]["zIndex"] == 0 and images[0]["groupId"] is None and images[0]["width"] is None
+    assert groups == []
+
+
+def test_archive_stores_duplicates_once(tmp_path, zstd):
+    shared = _image_bytes((200, 40, 90))
+    other = _image_bytes((1, 2, 3))
+    source = tmp_path / "shared.png"
+    source.write_bytes(bytes(shared))
+    # 同一内容来自字节与源文件两种来源，中间夹着另一张图片 / The same content from bytes and a source file, with another image between
+    items = [_item(shared), _item(other, index=1), _item(QByteArray(shared), index=2), _item(path=str(source), index=3)]
+    path = tmp_path / "board.srefz"
+    _save(path, items)
+
+    with zipfile.ZipFile(path) as zf:
+        entries = [name for name in zf.namelist() if name.startswith(board.IMAGE_DIR)]
+    assert sorted(entries) == ["images/0.png", "images/1.png"]
+
+    images, _ = _load(path)
+    _assert_round_trip(items, images, [shared, other, shared, shared])
+
+
+def test_archive_read_ahead_keeps_order(tmp_path):
+    # 多于预读窗口的图片仍按清单顺序产出 / More images than the read-ahead window still come out in manifest order
+    payloads = [_image_bytes((i, 255 - i, 7)) for i in range(board.ZIP_PREFETCH * 3)]
+    items = [_item(data, index=i) for i, data in enumerate(payloads)]
+    path = tmp_path / "board.srefz"
+    _save(path, items)
+
+    images, _ = _load(path)
+    _assert_round_trip(items, images, payloads)
+
+
+@pytest.mark.parametrize("ext", [".srefz", ".sref"])
+def test_path_backed_items(tmp_path, ext):
+    payload = _image_bytes((50, 60, 70), "JPEG")
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(bytes(payload))
+    items = [_item(path=str(source))]
+    path = tmp_path / ("board" + ext)
+    _save(path, items)
+    # 看板自包含：删除源文件后仍可读取 / The board is self-contained: it still loads after the source is deleted
+    source.unlink()
+
+    images, _ = _load(path)
+    _assert_round_trip(items, images, [payload])
+
+
+@pytest.mark.parametrize("ext", [".srefz", ".sref"])
+def test_failed_save_keeps_existing_board(tmp_path, ext):
+    payload = _image_bytes((200, 40, 90))
+    path = tmp_path / ("board" + ext)
+    _save(path, [_item(payload)])
+    before = path.read_bytes()
+
+    missing = str(tmp_path / "missing.png")
+    success, error = MainViewModel().save_board_data(str(path), [_item(payload), _item(path=missing, index=1)], GROUPS)
+    assert not success and error
+    assert path.read_bytes() == before
+    assert sorted(os.listdir(tmp_path)) == [path.name]
@@ -0,0 +1,115 @@
+"""
+画布图片项测试 / Canvas image item tests
+"""
+
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("PySide6")
+
+import shiboken6
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QRectF, QSize, QThreadPool
+from PySide6.QtGui import QColor, QImage, QPainter, QPixmapCache
+from PySide6.QtWidgets import QApplication, QGraphicsScene
+
+from Models.ImageLoader import pixmap_cache_limit
+from Views.Canvas import RefItem, RefView, load_item_pixmap, pixmap_cache_key
+
+IMAGE_COLOR = QColor(200, 40, 90)
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance() or QApplication([])
+    QPixmapCache.setCacheLimit(pixmap_cache_limit())
+    return app
+
+
+def _png_bytes(width=64, height=32, fmt="PNG"):
+    """
+    生成纯色图片字节 / Encode a solid-colour image
+    """
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(IMAGE_COLOR)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, fmt)
+    buffer.close()
+    return data
+
+
+def _render_center(scene, item):
+    """
+    渲染场景并读取图片项中心的像素 / Render the scene and read the pixel at the item's centre
+    """
+    rect = item.sceneBoundingRect()
+    target = QImage(int(rect.width()), int(rect.height()), QImage.Format_ARGB32)
+    target.fill(0)
+    painter = QPainter(target)
+    scene.render(painter, QRectF(target.rect()), rect)
+    painter.end()
+    return target.pixelColor(target.width() // 2, target.height() // 2)
+
+
+def test_cache_key_for_bytes(app):
+    data = _png_bytes()
+    key = pixmap_cache_key(data)
+    assert len(key) == 32
+    assert key == pixmap_cache_key(QByteArray(data))
+    assert key != pixmap_cache_key(_png_bytes(32, 64))
+
+
+def test_pasted_item_paints_image(app):
+    data = _png_bytes()
+    pixmap, source_size, key, preview = load_item_pixmap(data)
+    assert not pixmap.isNull() and not preview
+    item = RefItem(pixmap, data, source_size, key)
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    assert _render_center(scene, item) == IMAGE_COLOR
+
+
+def test_deferred_item_decodes_from_bytes(app):
+    data = _png_bytes()
+    item = RefItem.deferred(data, QSize(64, 32))
+    scene = QGraphicsScene()
+    scene.addItem(item)
+    assert item.full_pixmap().size() == QSize(64, 32)
+    assert _render_center(scene, item) == IMAGE_COLOR
+
+
+def _wait_for_decodes(app):
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+
+def test_paint_queues_decode_and_reuses_cache(app):
+    data = _png_bytes(3000, 2000, "JPEG")
+    scene = QGraphicsScene()
+    view = RefView(scene)
+    item = RefItem.deferred(data, QSize(3000, 2000), pixmap_key=pixmap_cache_key(data))
+    scene.addItem(item)
+
+    # 首次绘制只画占位并排队解码 / The first paint only draws the placeholder and queues the decode
+    assert _render_center(scene, item) != IMAGE_COLOR
+    assert item.pixmap().width() == 1
+    _wait_for_decodes(app)
+    assert not item._preview_only
+    assert item.pixmap().width() == view.decodeMaxSide()
+    assert abs(_render_center(scene, item).red() - IMAGE_COLOR.red()) < 8
+
+    # 离屏释放后重新进入视野：直接命中缓存，不再排队解码 / Back in view after eviction: a cache hit, no new decode
+    item.evict_pixmap()
+    _render_center(scene, item)
+    assert not view._pending_decodes
+    app.processEvents()
+    assert item.pixmap().width() == view.decodeMaxSide()
+    _wait_for_decodes(app)
+    shiboken6.delete(view)